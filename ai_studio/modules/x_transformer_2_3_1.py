@@ -4002,6 +4002,9 @@ class AutoregressiveWrapper(Module):
         cache_kv = True,
         return_prime=False,
         verbose=True,
+        generator: torch.Generator | None = None,
+        step_callback: Callable | None = None,
+        return_log_probs = False,
         **kwargs
     ):
         max_seq_len, greedy, device = self.max_seq_len, temperature == 0., prompts.device
@@ -4035,6 +4038,14 @@ class AutoregressiveWrapper(Module):
 
         cache = None
 
+        # gumbel noise for all steps, drawn in one go from the seeded generator (if given)
+
+        gumbel_noise = None
+
+        # summed log probability of each row's sampled tokens, up to and including eos
+
+        seq_log_probs = torch.zeros(b, device = device)
+
         # if doing contrastive decoding, turn off filter automatically
 
         if exists(amateur_model):
@@ -4108,8 +4119,29 @@ class AutoregressiveWrapper(Module):
                 sample = logits.argmax(dim = -1, keepdim = True)
             else:
                 filtered_logits = filter_logits_fn(logits, **filter_kwargs)
-                probs = F.softmax(filtered_logits / temperature, dim=-1)
-                sample = torch.multinomial(probs, 1)
+
+                if exists(generator):
+                    # gumbel-max trick - argmax(logits / t + g) is a sample from softmax(logits / t)
+
+                    if not exists(gumbel_noise):
+                        uniform = torch.rand((seq_len, *filtered_logits.shape), generator = generator, device = device)
+                        gumbel_noise = -torch.log(-torch.log(uniform))
+
+                    sample = (filtered_logits / temperature + gumbel_noise[sl]).argmax(dim = -1, keepdim = True)
+                else:
+                    probs = F.softmax(filtered_logits / temperature, dim=-1)
+                    sample = torch.multinomial(probs, 1)
+
+            # score the sample under the distribution it was drawn from
+
+            if return_log_probs:
+                sample_logits = logits if greedy else filtered_logits / temperature
+                step_log_probs = F.log_softmax(sample_logits.float(), dim = -1).gather(-1, sample).squeeze(-1)
+
+                if exists(eos_token):
+                    step_log_probs = step_log_probs.masked_fill((out == eos_token).any(dim = -1), 0.)
+
+                seq_log_probs = seq_log_probs + step_log_probs
 
             # concat sample
 
@@ -4118,6 +4150,9 @@ class AutoregressiveWrapper(Module):
             if verbose:
               if sl % 32 == 0:
                 print(sl, '/', seq_len)
+
+            if exists(step_callback):
+                step_callback(sl + 1, seq_len)
                 
             if not exists(eos_token):
                 continue
@@ -4145,6 +4180,10 @@ class AutoregressiveWrapper(Module):
 
         out, = unpack(out, ps, '* n')
 
+        if return_log_probs:
+            seq_log_probs, = unpack(seq_log_probs, ps, '*')
+            return out, seq_log_probs
+
         return out
     
     def compute_accuracy(self, logits, labels):
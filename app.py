@@ -91,6 +91,7 @@ from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon
 from ui.main_window import PianoRollMainWindow
 from config import theme # Import theme for APP_ICON_PATH
+from ui.widget_styles import GLOBAL_QSS
 import pretty_midi
 from utils import ensure_ai_dependencies  # Import AI dependency setup
 
@@ -180,6 +181,9 @@ def main():
 
     # app.setStyle('Fusion') # Commented out to allow custom QSS to take full effect
 
+    # Shared ModernButton/ModernIconButton/ModernSlider rules, parsed once for all widgets
+    app.setStyleSheet(GLOBAL_QSS)
+
     # Optional: Load initial MIDI data if a file is specified via an environment variable or argument
     # For simplicity, this example does not load initial data by default.
     # You could add logic here to load from a default file or command-line argument.
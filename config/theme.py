@@ -34,6 +34,7 @@ ACCENT_HOVER_COLOR = QColor(20, 142, 224)    # #148EE0 - Hover state for accent
 ACCENT_PRESSED_COLOR = QColor(0, 102, 184)   # #0066B8 - Pressed state for accent elements (darker)
 
 DISABLED_BG_COLOR = QColor(50, 50, 50)       # #323232 - Background for disabled controls
+DISABLED_BORDER_COLOR = DISABLED_BG_COLOR.darker(110) # Border for disabled controls
 
 # Standard Button Colors (for non-accented buttons)
 STANDARD_BUTTON_BG_COLOR = QColor(45, 45, 50)
@@ -81,6 +82,45 @@ NOTE_MED_COLOR = QColor(70, 180, 210)                    # #46B4D2
 NOTE_HIGH_COLOR = QColor(230, 120, 190)                  # #E678BE
 NOTE_BORDER_COLOR = QColor(0, 0, 0, 100)                 # #000000 with alpha - Subtle border for notes
 
+# --- Precomputed QSS Color Strings ---
+# Hex strings (and lighter/darker variants) interpolated into widget stylesheets,
+# derived once here instead of via QColor.name()/lighter()/darker() per widget.
+ACCENT_PRIMARY_NAME = ACCENT_PRIMARY_COLOR.name()
+ACCENT_PRIMARY_L105 = ACCENT_PRIMARY_COLOR.lighter(105).name()
+ACCENT_PRIMARY_L115 = ACCENT_PRIMARY_COLOR.lighter(115).name()
+ACCENT_PRIMARY_D115 = ACCENT_PRIMARY_COLOR.darker(115).name()
+ACCENT_PRIMARY_D120 = ACCENT_PRIMARY_COLOR.darker(120).name()
+ACCENT_PRIMARY_D130 = ACCENT_PRIMARY_COLOR.darker(130).name()
+ACCENT_HOVER_NAME = ACCENT_HOVER_COLOR.name()
+ACCENT_HOVER_L105 = ACCENT_HOVER_COLOR.lighter(105).name()
+ACCENT_HOVER_L115 = ACCENT_HOVER_COLOR.lighter(115).name()
+ACCENT_HOVER_D115 = ACCENT_HOVER_COLOR.darker(115).name()
+ACCENT_HOVER_D120 = ACCENT_HOVER_COLOR.darker(120).name()
+ACCENT_HOVER_D130 = ACCENT_HOVER_COLOR.darker(130).name()
+ACCENT_PRESSED_NAME = ACCENT_PRESSED_COLOR.name()
+ACCENT_PRESSED_L115 = ACCENT_PRESSED_COLOR.lighter(115).name()
+ACCENT_PRESSED_D105 = ACCENT_PRESSED_COLOR.darker(105).name()
+ACCENT_PRESSED_D115 = ACCENT_PRESSED_COLOR.darker(115).name()
+ACCENT_PRESSED_D120 = ACCENT_PRESSED_COLOR.darker(120).name()
+ACCENT_PRESSED_D130 = ACCENT_PRESSED_COLOR.darker(130).name()
+ACCENT_TEXT_NAME = ACCENT_TEXT_COLOR.name()
+
+STANDARD_BUTTON_BG_NAME = STANDARD_BUTTON_BG_COLOR.name()
+STANDARD_BUTTON_BG_L105 = STANDARD_BUTTON_BG_COLOR.lighter(105).name()
+STANDARD_BUTTON_HOVER_BG_NAME = STANDARD_BUTTON_HOVER_BG_COLOR.name()
+STANDARD_BUTTON_HOVER_BG_L105 = STANDARD_BUTTON_HOVER_BG_COLOR.lighter(105).name()
+STANDARD_BUTTON_PRESSED_BG_NAME = STANDARD_BUTTON_PRESSED_BG_COLOR.name()
+STANDARD_BUTTON_PRESSED_BG_D105 = STANDARD_BUTTON_PRESSED_BG_COLOR.darker(105).name()
+STANDARD_BUTTON_PRESSED_BG_D120 = STANDARD_BUTTON_PRESSED_BG_COLOR.darker(120).name()
+STANDARD_BUTTON_TEXT_NAME = STANDARD_BUTTON_TEXT_COLOR.name()
+
+PRIMARY_TEXT_NAME = PRIMARY_TEXT_COLOR.name()
+BORDER_COLOR_NORMAL_NAME = BORDER_COLOR_NORMAL.name()
+BORDER_COLOR_HOVER_NAME = BORDER_COLOR_HOVER.name()
+DISABLED_BG_NAME = DISABLED_BG_COLOR.name()
+DISABLED_TEXT_NAME = DISABLED_TEXT_COLOR.name()
+DISABLED_BORDER_NAME = DISABLED_BORDER_COLOR.name()
+
 # =============================================================================
 # --- Fonts ---
 # =============================================================================
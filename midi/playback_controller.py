@@ -25,7 +25,7 @@ class PlaybackController:
         self._is_playing_internal = False
         self.paused = False
         self.current_playback_time_sec = 0.0 # Time from start of current playback segment
-        self.playback_start_real_time = 0.0  # time.time() when playback (re)started
+        self.playback_start_real_time = 0.0  # time.monotonic() when playback (re)started; monotonic so clock adjustments cannot move the playhead
         self.pause_start_time_sec = 0.0 # Stores current_playback_time_sec when paused
 
         self.tempo_bpm = 120.0
@@ -110,11 +110,11 @@ class PlaybackController:
 
         if self.paused: # Resuming
             # Adjust start time to account for pause duration
-            self.playback_start_real_time = time.time() - self.pause_start_time_sec / self.tempo_scale_factor
+            self.playback_start_real_time = time.monotonic() - self.pause_start_time_sec / self.tempo_scale_factor
             self.paused = False
             if self.log_events: print(f"PlaybackController: Resuming from {self.pause_start_time_sec:.2f}s.")
         else: # Starting new or from a seek
-            self.playback_start_real_time = time.time() - self.current_playback_time_sec / self.tempo_scale_factor
+            self.playback_start_real_time = time.monotonic() - self.current_playback_time_sec / self.tempo_scale_factor
             self.note_scheduler.reset_playback_position(self.current_playback_time_sec)
             if self.log_events: print(f"PlaybackController: Starting playback from {self.current_playback_time_sec:.2f}s.")
         
@@ -170,7 +170,7 @@ class PlaybackController:
         # If it was playing, need to restart the thread from the new position
         # or if paused, update the resume point.
         if self._is_playing_internal or self.paused:
-            self.playback_start_real_time = time.time() - self.current_playback_time_sec / self.tempo_scale_factor
+            self.playback_start_real_time = time.monotonic() - self.current_playback_time_sec / self.tempo_scale_factor
             if self._is_playing_internal and not self.paused and self.note_scheduler: # Was playing, restart thread
                 # self.note_scheduler.stop_playback_thread() # Stop existing - handled by start_playback_thread if needed
                 self.note_scheduler.start_playback_thread() # Start new from current pos
@@ -180,7 +180,7 @@ class PlaybackController:
 
     def get_current_position(self) -> float:
         if self._is_playing_internal and not self.paused:
-            elapsed_real_time = time.time() - self.playback_start_real_time
+            elapsed_real_time = time.monotonic() - self.playback_start_real_time
             self.current_playback_time_sec = elapsed_real_time * self.tempo_scale_factor
             return self.current_playback_time_sec
         elif self.paused:
@@ -217,7 +217,7 @@ class PlaybackController:
         
         # Adjust start time to maintain current logical position with new tempo
         if self._is_playing_internal or self.paused:
-             self.playback_start_real_time = time.time() - (current_pos_before_tempo_change / self.tempo_scale_factor)
+             self.playback_start_real_time = time.monotonic() - (current_pos_before_tempo_change / self.tempo_scale_factor)
         
         if self.log_events: print(f"PlaybackController: Tempo scale factor: {self.tempo_scale_factor}")
 
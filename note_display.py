@@ -14,12 +14,12 @@ Keyboard Shortcuts:
 
 import sys
 import os # For file extension check
-from PySide6.QtWidgets import QWidget, QApplication, QSizePolicy, QMessageBox, QHBoxLayout, QScrollArea
-from PySide6.QtCore import Qt, QRect, QSize, QPoint, Signal, QRectF, QMimeData, QUrl, QTimer
+from PySide6.QtWidgets import QWidget, QApplication, QSizePolicy, QMessageBox, QHBoxLayout, QScrollArea, QAbstractScrollArea
+from PySide6.QtCore import Qt, QRect, QSize, QPoint, QLine, Signal, QRectF, QMimeData, QUrl, QTimer, QEvent
 from PySide6.QtGui import (
     QPainter, QColor, QPen, QBrush, QLinearGradient, QFont, 
     QRadialGradient, QFontMetrics, QDragEnterEvent, QDropEvent, QMouseEvent, QDragLeaveEvent, QDragMoveEvent,
-    QPaintEvent, QWheelEvent, QKeyEvent # Import QWheelEvent and QKeyEvent
+    QPaintEvent, QWheelEvent, QKeyEvent, QPixmap # Import QWheelEvent and QKeyEvent
 )
 import pretty_midi
 import math # Import math
@@ -36,8 +36,11 @@ from config.theme import (
     ACCENT_PRIMARY_COLOR, DRAG_OVERLAY_COLOR, SECONDARY_TEXT_COLOR # Updated general theme colors
 )
 from ui.drawing_utils import (
-    draw_time_grid, draw_piano_keys, draw_notes, draw_playhead
+    draw_time_grid, draw_piano_keys, draw_notes, draw_playhead, build_note_index, playhead_triangle,
+    pitch_y_tops, paint_cache, visible_pitch_range, visible_line_positions, notes_in_view_range, note_geometry, draw_grid_text,
+    MEASURE_NUMBER_REACH, NOTE_NAMES, IS_C_ROW
 )
+from ui.widget_styles import PIANO_ROLL_SCROLL_QSS
 from config import theme
 
 class PianoRollDisplay(QWidget):
@@ -51,9 +54,21 @@ class PianoRollDisplay(QWidget):
     MIN_VERTICAL_ZOOM = 0.25
     MAX_VERTICAL_ZOOM = 4.0
 
+    # x of time 0; subclasses without the keyboard column override this
+    PLAYHEAD_X_OFFSET = WHITE_KEY_WIDTH
+
     def __init__(self, notes=None, parent=None):
         super().__init__(parent)
         self.notes: list[pretty_midi.Note] = notes or []
+        self._note_index = None # Start-sorted view of self.notes for culling, rebuilt lazily
+        # Grid, keys and notes of the visible area, so playhead-only repaints are a blit
+        self._backing = None
+        self._backing_key = None
+        self._last_visible_rect = None # Viewport at the previous paint, to tell scrolling from settled repaints
+        # Vertical scroll value of the enclosing scroll area, kept current by _track_vertical_scroll()
+        self._scroll_y = 0
+        self._vertical_scroll_bar = None
+        self._track_vertical_scroll()
         self.playhead_position = 0.0
         self.target_playhead_position = 0.0
         self.total_time = 0.0 # Initialize total_time
@@ -99,26 +114,31 @@ class PianoRollDisplay(QWidget):
         new_pos = self.playhead_position + (self.target_playhead_position - self.playhead_position) * interpolation_factor
         self._update_display_playhead_position(new_pos)
 
+    def _playhead_band(self, position):
+        """Widget rect covered by the playhead line, triangle and shadow at the given time."""
+        playhead_dirty_width = theme.ICON_SIZE_S + 8 # pixels (approximate visual width of playhead + shadow)
+        playhead_x_center = position * self.time_scale + self.PLAYHEAD_X_OFFSET
+        return QRect(int(playhead_x_center - playhead_dirty_width / 2), 0, playhead_dirty_width, self.height())
+
     def _update_display_playhead_position(self, new_display_pos):
         """Internal method to update the visual playhead and trigger repaint."""
         if self.playhead_position == new_display_pos:
             return
 
-        playhead_dirty_width = theme.ICON_SIZE_S + 8 # pixels (approximate visual width of playhead + shadow)
-        
-        # Calculate old playhead rect
-        old_playhead_x_center = self.playhead_position * self.time_scale + WHITE_KEY_WIDTH
-        old_rect_x = int(old_playhead_x_center - playhead_dirty_width / 2)
-        old_rect = QRect(old_rect_x, 0, playhead_dirty_width, self.height())
-
+        old_rect = self._playhead_band(self.playhead_position)
+        old_x = int(self.playhead_position * self.time_scale)
         self.playhead_position = new_display_pos
+        new_rect = self._playhead_band(self.playhead_position)
 
-        # Calculate new playhead rect
-        new_playhead_x_center = self.playhead_position * self.time_scale + WHITE_KEY_WIDTH
-        new_rect_x = int(new_playhead_x_center - playhead_dirty_width / 2)
-        new_rect = QRect(new_rect_x, 0, playhead_dirty_width, self.height())
-        
-        self.update(old_rect.united(new_rect))
+        # The interpolation timer mostly makes sub-pixel steps; the playhead is drawn at a
+        # whole pixel, so nothing needs repainting until that pixel changes
+        if old_rect == new_rect and old_x == int(new_display_pos * self.time_scale):
+            return
+
+        # Two separate bands rather than their union, so a seek does not repaint
+        # everything between the old and new positions
+        self.update(old_rect)
+        self.update(new_rect)
 
     def _update_quantization_value(self):
         beats_per_second = self.bpm / 60.0
@@ -127,6 +147,7 @@ class PianoRollDisplay(QWidget):
 
     def set_notes(self, notes: list[pretty_midi.Note]):
         self.notes = notes if notes is not None else []
+        self._invalidate_static_cache()
         self.calculate_total_width()
         self.notesChanged.emit(self.notes) 
         self.update()
@@ -137,6 +158,7 @@ class PianoRollDisplay(QWidget):
             return
         self.notes.append(note)
         self.notes.sort(key=lambda n: (n.start, n.pitch))
+        self._invalidate_static_cache()
         original_min_width = self.minimumWidth()
         self.calculate_total_width()
         if emit_change:
@@ -181,11 +203,7 @@ class PianoRollDisplay(QWidget):
         self.update()
     
     def calculate_total_width(self):
-        max_time = 0.0
-        if self.notes:
-            for note in self.notes:
-                if hasattr(note, 'end') and note.end > max_time:
-                    max_time = note.end
+        max_time = self.latest_note_end()
         min_visible_bars = 4
         min_time_from_bars = min_visible_bars * self.time_signature_numerator * (60.0 / self.bpm)
         self.total_time = max(max_time + 2.0, min_time_from_bars)
@@ -202,12 +220,81 @@ class PianoRollDisplay(QWidget):
         effective_white_key_height = WHITE_KEY_HEIGHT * self.vertical_zoom_factor
         return QSize(self.minimumWidth(), int(num_white_keys * effective_white_key_height))
     
+    def _ensure_note_index(self):
+        """The note index for self.notes, rebuilt after _invalidate_static_cache()."""
+        if self._note_index is None:
+            self._note_index = build_note_index(self.notes)
+        return self._note_index
+
+    def latest_note_end(self):
+        """End time of the last-ending note, read from the index's validated end-time array."""
+        ends = self._ensure_note_index()[3][2]
+        return float(ends.max()) if len(ends) else 0.0
+
+    def _invalidate_static_cache(self):
+        """Drop everything derived from self.notes; call whenever the note list changes."""
+        self._note_index = None
+        self._backing = None
+
+    def _static_backing(self, visible_rect, build):
+        """
+        Pixmap of everything but the playhead over visible_rect. A stale pixmap is only
+        re-rendered when build is true; otherwise None is returned.
+        """
+        device_pixel_ratio = self.devicePixelRatioF()
+        # Notes are covered by _invalidate_static_cache(); the rest of the view state is keyed here
+        key = (visible_rect.x(), visible_rect.y(), visible_rect.width(), visible_rect.height(), device_pixel_ratio,
+               self.time_scale, self.vertical_zoom_factor, self.bpm,
+               self.time_signature_numerator, self.time_signature_denominator,
+               self._is_dragging_midi, self._scroll_y)
+        if self._backing is None or self._backing_key != key:
+            if not build:
+                return None
+            backing = QPixmap(int(visible_rect.width() * device_pixel_ratio), int(visible_rect.height() * device_pixel_ratio))
+            backing.setDevicePixelRatio(device_pixel_ratio)
+            backing_painter = QPainter(backing)
+            backing_painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+            backing_painter.translate(-visible_rect.x(), -visible_rect.y())
+            self._paint_static(backing_painter, visible_rect)
+            backing_painter.end()
+            self._backing = backing
+            self._backing_key = key
+        return self._backing
+
     def paintEvent(self, event: QPaintEvent):
         painter = QPainter(self)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing | QPainter.RenderHint.SmoothPixmapTransform)
-        
+        exposed_rect = event.rect()
+        visible_rect = self.visibleRegion().boundingRect()
+
+        # Each scroll step moves the viewport and exposes only a strip, which is cheaper to
+        # paint directly than re-rendering the whole viewport into the backing. The backing is
+        # rebuilt for whole-viewport repaints, or once the viewport is the same as at the
+        # previous paint (playhead bands after scrolling has stopped)
+        viewport_settled = visible_rect == self._last_visible_rect
+        self._last_visible_rect = visible_rect
+        backing = None
+        if visible_rect.contains(exposed_rect):
+            backing = self._static_backing(visible_rect, build=viewport_settled or exposed_rect == visible_rect)
+
+        if backing is not None:
+            # Source rect is in device pixels of the backing pixmap
+            device_pixel_ratio = self.devicePixelRatioF()
+            source_rect = exposed_rect.translated(-visible_rect.x(), -visible_rect.y())
+            painter.drawPixmap(QRectF(exposed_rect), backing,
+                               QRectF(source_rect.x() * device_pixel_ratio, source_rect.y() * device_pixel_ratio,
+                                      source_rect.width() * device_pixel_ratio, source_rect.height() * device_pixel_ratio))
+        else:
+            painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+            self._paint_static(painter, exposed_rect)
+
+        if exposed_rect.intersects(self._playhead_band(self.playhead_position)):
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+            self._paint_playhead(painter)
+
+    def _paint_static(self, painter, rect):
+        """Paint background, drag overlay, grid, keys and notes within rect."""
         # Use solid PIANO_ROLL_BG_COLOR
-        painter.fillRect(event.rect(), theme.PIANO_ROLL_BG_COLOR)
+        painter.fillRect(rect, theme.PIANO_ROLL_BG_COLOR)
 
         # Draw drag overlay BEFORE notes to prevent pink glitch
         if self._is_dragging_midi:
@@ -224,11 +311,49 @@ class PianoRollDisplay(QWidget):
         # Draw regular UI elements after the overlay
         draw_time_grid(painter, self.width(), self.height(), self.time_scale, self.bpm,
                        self.time_signature_numerator, self.time_signature_denominator, 
-                       self.parentWidget(), self.vertical_zoom_factor)
-        draw_piano_keys(painter, self.vertical_zoom_factor) 
-        draw_notes(painter, self.notes, self.time_scale, self.vertical_zoom_factor) 
+                       self._scroll_y, self.vertical_zoom_factor, visible_rect=rect)
+        # Playback only dirties narrow playhead bands, which rarely reach the keyboard column
+        if rect.left() < WHITE_KEY_WIDTH:
+            draw_piano_keys(painter, self.vertical_zoom_factor) 
+        draw_notes(painter, self.notes, self.time_scale, self.vertical_zoom_factor,
+                   visible_rect=rect, note_index=self._ensure_note_index())
+
+    def _paint_playhead(self, painter):
         draw_playhead(painter, self.playhead_position, self.time_scale, self.height())
 
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.ParentChange:
+            self._track_vertical_scroll()
+        super().changeEvent(event)
+
+    def _track_vertical_scroll(self):
+        """
+        Follow the vertical scroll bar of the enclosing scroll area (the parent, or the
+        viewport's parent) in self._scroll_y, so painting never has to look it up.
+        """
+        scroll_bar = None
+        parent_widget = self.parentWidget()
+        if isinstance(parent_widget, QAbstractScrollArea):
+            scroll_bar = parent_widget.verticalScrollBar()
+        elif parent_widget is not None and isinstance(parent_widget.parentWidget(), QAbstractScrollArea):
+            scroll_bar = parent_widget.parentWidget().verticalScrollBar()
+        if scroll_bar is self._vertical_scroll_bar:
+            return
+        if self._vertical_scroll_bar is not None:
+            try:
+                self._vertical_scroll_bar.valueChanged.disconnect(self._on_vertical_scroll)
+            except (RuntimeError, TypeError):
+                pass # The old scroll area has already been deleted
+        self._vertical_scroll_bar = scroll_bar
+        if scroll_bar is not None:
+            scroll_bar.valueChanged.connect(self._on_vertical_scroll)
+            self._scroll_y = scroll_bar.value()
+        else:
+            self._scroll_y = 0
+
+    def _on_vertical_scroll(self, value):
+        self._scroll_y = value
+
     def _pixel_to_time(self, x_pos: int) -> float:
         if x_pos <= WHITE_KEY_WIDTH: return 0.0
         return (x_pos - WHITE_KEY_WIDTH) / self.time_scale
@@ -563,12 +688,7 @@ class PianoRollComposite(QWidget):
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
         self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: #1c1c20;
-            }
-        """)
+        self.scroll_area.setStyleSheet(PIANO_ROLL_SCROLL_QSS)
         
         # Create the note area (piano roll without piano keys)
         self.note_area = PianoRollNoteArea(self._notes)
@@ -591,6 +711,7 @@ class PianoRollComposite(QWidget):
         self.set_playhead_position = self.note_area.set_playhead_position
         self.set_bpm = self.note_area.set_bpm
         self.set_time_signature = self.note_area.set_time_signature
+        self.latest_note_end = self.note_area.latest_note_end
     
     @property
     def notes(self):
@@ -599,6 +720,7 @@ class PianoRollComposite(QWidget):
     @notes.setter
     def notes(self, value):
         self.note_area.notes = value
+        self.note_area._invalidate_static_cache()
     
     @property 
     def playhead_position(self):
@@ -649,40 +771,15 @@ class FixedPianoKeysWidget(QWidget):
 class PianoRollNoteArea(PianoRollDisplay):
     """Piano roll display without piano keys - only notes, grid, and playhead"""
     
+    # No piano key column here, so the playhead starts at x = 0
+    PLAYHEAD_X_OFFSET = 0
+
     def __init__(self, notes=None, parent=None):
         super().__init__(notes, parent)
-        # Remove the piano key width offset since we don't draw piano keys here
-        
-    def _update_display_playhead_position(self, new_display_pos):
-        """
-        🔧 FIXED: Internal method to update the visual playhead and trigger repaint.
-        Overridden to handle coordinate system without WHITE_KEY_WIDTH offset.
-        """
-        if self.playhead_position == new_display_pos:
-            return
-
-        playhead_dirty_width = theme.ICON_SIZE_S + 8 # pixels (approximate visual width of playhead + shadow)
-        
-        # 🔧 FIXED: Calculate old playhead rect WITHOUT WHITE_KEY_WIDTH offset
-        old_playhead_x_center = self.playhead_position * self.time_scale  # No offset!
-        old_rect_x = int(old_playhead_x_center - playhead_dirty_width / 2)
-        old_rect = QRect(old_rect_x, 0, playhead_dirty_width, self.height())
-
-        self.playhead_position = new_display_pos
-
-        # 🔧 FIXED: Calculate new playhead rect WITHOUT WHITE_KEY_WIDTH offset
-        new_playhead_x_center = self.playhead_position * self.time_scale  # No offset!
-        new_rect_x = int(new_playhead_x_center - playhead_dirty_width / 2)
-        new_rect = QRect(new_rect_x, 0, playhead_dirty_width, self.height())
-        
-        self.update(old_rect.united(new_rect))
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing | QPainter.RenderHint.SmoothPixmapTransform)
         
+    def _paint_static(self, painter, rect):
         # Use solid PIANO_ROLL_BG_COLOR
-        painter.fillRect(event.rect(), theme.PIANO_ROLL_BG_COLOR)
+        painter.fillRect(rect, theme.PIANO_ROLL_BG_COLOR)
 
         # Draw drag overlay BEFORE notes to prevent pink glitch
         if self._is_dragging_midi:
@@ -697,47 +794,50 @@ class PianoRollNoteArea(PianoRollDisplay):
             painter.restore()
 
         # Draw grid without piano keys area
-        self._draw_note_area_grid(painter)
+        self._draw_note_area_grid(painter, rect)
         
         # Draw notes (adjusted for no piano key offset)
-        self._draw_notes_no_piano_offset(painter)
-        
+        self._draw_notes_no_piano_offset(painter, rect)
+
+    def _paint_playhead(self, painter):
         # Draw playhead (adjusted for no piano key offset)
         self._draw_playhead_no_piano_offset(painter)
     
-    def _draw_note_area_grid(self, painter):
-        """Draw time grid without piano keys area"""
+    def _draw_note_area_grid(self, painter, rect):
+        """Draw time grid without piano keys area, limited to the rows and lines inside rect"""
         width = self.width()
         height = self.height()
+        left, right = max(0, rect.left()), min(width, rect.right() + 1)
+        lowest_pitch, highest_pitch = visible_pitch_range(rect, self.vertical_zoom_factor)
         
         effective_white_key_height = WHITE_KEY_HEIGHT * self.vertical_zoom_factor
         
-        current_viewport_y_offset = 0
-        parent_widget = self.parentWidget()
-        if parent_widget and hasattr(parent_widget, 'verticalScrollBar'):
-            current_viewport_y_offset = parent_widget.verticalScrollBar().value()
-        elif parent_widget and hasattr(parent_widget, 'parentWidget') and parent_widget.parentWidget():
-            grandparent_obj = parent_widget.parentWidget()
-            if grandparent_obj and hasattr(grandparent_obj, 'verticalScrollBar'):
-                current_viewport_y_offset = grandparent_obj.verticalScrollBar().value()
+        current_viewport_y_offset = self._scroll_y
+        pens, fonts, brushes = paint_cache()
+
+        # Grid lines are all axis-aligned, so draw them without antialiasing
+        prev_antialiasing = painter.testRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
         
         # Draw horizontal lines for note rows
-        painter.setPen(QPen(theme.KEY_GRID_LINE_COLOR, 0.8, Qt.PenStyle.SolidLine))
-        for pitch in range(MIN_PITCH, MAX_PITCH + 1):
-            y_pos = (MAX_PITCH - pitch) * effective_white_key_height
-            painter.drawLine(0, int(y_pos), width, int(y_pos))  # Start from 0 instead of WHITE_KEY_WIDTH
-            note_name = pretty_midi.note_number_to_name(pitch)
-            if note_name.endswith('C') and '#' not in note_name:
-                highlight_rect = QRect(0, int(y_pos), width, int(effective_white_key_height))  # Start from 0
-                painter.fillRect(highlight_rect, theme.GRID_ROW_HIGHLIGHT_COLOR)
+        row_height = int(effective_white_key_height)
+        ytops = pitch_y_tops(self.vertical_zoom_factor)
+        visible_pitches = range(lowest_pitch, highest_pitch + 1)
+        painter.setPen(pens['row_line'])
+        painter.drawLines([QLine(left, ytops[pitch], right, ytops[pitch]) for pitch in visible_pitches])  # No WHITE_KEY_WIDTH offset
+        # C-row highlights in one call
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(brushes['row_highlight'])
+        painter.drawRects([QRect(left, ytops[pitch], right - left, row_height) for pitch in visible_pitches if IS_C_ROW[pitch]])
+        painter.setBrush(Qt.BrushStyle.NoBrush)
 
         # Time signature display
         ts_text = f"{self.time_signature_numerator}/{self.time_signature_denominator}"
-        painter.setPen(QPen(theme.SECONDARY_TEXT_COLOR, 1.0))
-        painter.setFont(QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_S, weight=theme.FONT_WEIGHT_BOLD))
+        painter.setPen(pens['grid_text'])
+        painter.setFont(fonts['time_signature'])
         ts_x_pos = theme.PADDING_S  # No WHITE_KEY_WIDTH offset
         ts_y_pos = current_viewport_y_offset + theme.PADDING_M + theme.FONT_SIZE_S
-        painter.drawText(ts_x_pos, ts_y_pos, ts_text)
+        draw_grid_text(painter, ts_x_pos, ts_y_pos, ts_text, 'time_signature')
 
         actual_pixels_per_quarter_note = 0
         if self.bpm > 0:
@@ -745,119 +845,106 @@ class PianoRollNoteArea(PianoRollDisplay):
             actual_pixels_per_quarter_note = self.time_scale * seconds_per_quarter_note
         
         # Draw sixteenth note lines
-        painter.setPen(QPen(theme.GRID_LINE_COLOR, 0.5, Qt.PenStyle.DotLine))
+        painter.setPen(pens['sixteenth_line'])
         sixteenth_note_step_pixels = actual_pixels_per_quarter_note / 4.0 if actual_pixels_per_quarter_note > 0 else 0
         if sixteenth_note_step_pixels > 5:
-            for i in range(int(width / sixteenth_note_step_pixels) + 1):
-                if i % 4 != 0:
-                    x = i * sixteenth_note_step_pixels  # No WHITE_KEY_WIDTH offset
-                    painter.drawLine(int(x), 0, int(x), height)
+            # No WHITE_KEY_WIDTH offset; every 4th sixteenth is a beat or measure line
+            _, sixteenth_xs = visible_line_positions(sixteenth_note_step_pixels, 0, left, right,
+                                                     int(width / sixteenth_note_step_pixels) + 1, skip_every=4)
+            painter.drawLines([QLine(x, 0, x, height) for x in sixteenth_xs])
 
         pixels_per_beat = actual_pixels_per_quarter_note * (4.0 / self.time_signature_denominator) if self.time_signature_denominator > 0 else actual_pixels_per_quarter_note
         
         # Draw beat lines
         if pixels_per_beat > 0:
-            painter.setPen(QPen(theme.GRID_BEAT_LINE_COLOR, 0.7, Qt.PenStyle.SolidLine))
-            for i in range(int(width / pixels_per_beat) + 1):
-                if i % self.time_signature_numerator != 0:
-                    x = i * pixels_per_beat  # No WHITE_KEY_WIDTH offset
-                    painter.drawLine(int(x), 0, int(x), height)
+            painter.setPen(pens['beat_line'])
+            _, beat_xs = visible_line_positions(pixels_per_beat, 0, left, right,
+                                                int(width / pixels_per_beat) + 1, skip_every=self.time_signature_numerator)
+            painter.drawLines([QLine(x, 0, x, height) for x in beat_xs])
 
         # Draw measure lines
         if pixels_per_beat > 0 and self.time_signature_numerator > 0:
             pixels_per_measure = pixels_per_beat * self.time_signature_numerator
             if pixels_per_measure > 0:
-                painter.setPen(QPen(theme.GRID_MEASURE_LINE_COLOR, 1.0, Qt.PenStyle.SolidLine))
+                # Start a little left of the view so numbers of measures just off-screen still show
+                measure_indices, measure_xs = visible_line_positions(pixels_per_measure, 0, left - MEASURE_NUMBER_REACH, right,
+                                                                     int(width / pixels_per_measure) + 1)  # No WHITE_KEY_WIDTH offset
+                painter.setPen(pens['measure_line'])
+                painter.drawLines([QLine(x, 0, x, height) for x in measure_xs])
+                # Numbers in a second pass so the line and text pens are each set once
                 measure_number_y_pos = current_viewport_y_offset + theme.PADDING_M + theme.FONT_SIZE_S
-                for i in range(int(width / pixels_per_measure) + 1):
-                    x = i * pixels_per_measure  # No WHITE_KEY_WIDTH offset
-                    painter.drawLine(int(x), 0, int(x), height)
-                    painter.setPen(QPen(theme.SECONDARY_TEXT_COLOR, 1.0))
-                    painter.setFont(QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_XS))
-                    painter.drawText(int(x + theme.PADDING_XS), measure_number_y_pos, str(i + 1))
+                painter.setPen(pens['grid_text'])
+                painter.setFont(fonts['measure_number'])
+                for i, x in zip(measure_indices, measure_xs):
+                    draw_grid_text(painter, x + theme.PADDING_XS, measure_number_y_pos, str(i + 1), 'measure_number')
+
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, prev_antialiasing)
     
-    def _draw_notes_no_piano_offset(self, painter):
-        """Draw notes without piano key offset"""
-        effective_white_key_height = WHITE_KEY_HEIGHT * self.vertical_zoom_factor
-        effective_black_key_height = BLACK_KEY_HEIGHT * self.vertical_zoom_factor
-
-        for note in self.notes:
-            if not hasattr(note, 'pitch') or not hasattr(note, 'start') or not hasattr(note, 'end'): 
-                continue
-            pitch = note.pitch
-            if pitch < MIN_PITCH or pitch > MAX_PITCH: 
-                continue
-            
-            y_pos = (MAX_PITCH - pitch) * effective_white_key_height 
-            x_pos = note.start * self.time_scale  # No WHITE_KEY_WIDTH offset
-            width = max((note.end - note.start) * self.time_scale, 4)
-            pitch_class = pitch % 12
-            is_white = pitch_class in [0, 2, 4, 5, 7, 9, 11]
-            padding = 4 
-
-            if is_white:
-                height = effective_white_key_height - padding 
-                y_offset = padding / 2
-            else:
-                height = effective_black_key_height - padding 
-                y_offset = (effective_white_key_height - effective_black_key_height) / 2 + (padding / 2)
-                
-            velocity = getattr(note, 'velocity', 64)
-            
-            # Use theme note colors based on velocity
-            if velocity < 42:
-                base_color = theme.NOTE_LOW_COLOR
-            elif velocity < 85:
-                base_color = theme.NOTE_MED_COLOR
+    def _draw_notes_no_piano_offset(self, painter, rect):
+        """Draw the notes overlapping rect, without piano key offset"""
+        pens, fonts, brushes = paint_cache()
+        gradient_brushes = (brushes['note_area_low'], brushes['note_area_med'], brushes['note_area_high'])
+        flat_brushes = (brushes['note_low_flat'], brushes['note_med_flat'], brushes['note_high_flat'])
+        border_pen, label_pen = pens['note_area_border'], pens['note_label']
+        painter.setFont(fonts['note_label']) # Bigger, bolder font for note labels
+
+        note_index = self._ensure_note_index()
+        note_arrays = note_index[3]
+        if self.time_scale > 0:
+            lo, hi = notes_in_view_range(note_index, rect, self.time_scale, x_offset=0)
+            note_arrays = tuple(a[lo:hi] for a in note_arrays)
+        lowest_pitch, highest_pitch = visible_pitch_range(rect, self.vertical_zoom_factor)
+
+        # Borders share one pen; labels are drawn afterwards so the pen is not swapped per note
+        painter.setPen(border_pen)
+        gradient_rects = ([], [], [])
+        flat_rects = ([], [], [])
+        labels = []
+        # Geometry is precomputed for all notes at once (no WHITE_KEY_WIDTH offset); theme note
+        # colors are bucketed by velocity at 42 and 85
+        geometry = note_geometry(note_arrays, self.time_scale, self.vertical_zoom_factor,
+                                 lowest_pitch, highest_pitch, x_offset=0, velocity_splits=(42, 85))
+        for pitch, x_pos, y_pos, width, height, bucket, is_flat, has_label in zip(*geometry):
+            note_rect = QRect(int(x_pos), int(y_pos), int(width), int(height))
+            if is_flat:
+                # Gradient would not be visible; batched with a solid brush below
+                flat_rects[bucket].append(note_rect)
             else:
-                base_color = theme.NOTE_HIGH_COLOR
-            
-            note_rect = QRect(int(x_pos), int(y_pos + y_offset), int(width), int(height))
-            
-            # Draw note with gradient
-            from PySide6.QtGui import QLinearGradient
-            gradient = QLinearGradient(note_rect.topLeft(), note_rect.bottomLeft())
-            gradient.setColorAt(0.0, base_color.lighter(120))
-            gradient.setColorAt(1.0, base_color)
-            painter.fillRect(note_rect, gradient)
-            
-            # Draw border
-            painter.setPen(QPen(theme.NOTE_BORDER_COLOR, 1.0))
-            painter.drawRect(note_rect)
-            
-            # Note labels - make them bold and visible
-            corrected_label_name_note = pretty_midi.note_number_to_name(pitch)
-
-            note_block_font = QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_S, weight=theme.FONT_WEIGHT_BOLD) # Bigger, bolder font
-            painter.setFont(note_block_font)
-            
-            # Use high contrast color for note labels - white with some transparency for visibility
-            note_label_color = QColor(255, 255, 255, 220)  # Bright white with high opacity
-            painter.setPen(QPen(note_label_color))
-            
-            note_content_rect = QRectF(x_pos, y_pos + y_offset, width, height)
+                gradient_rects[bucket].append(note_rect)
             
-            # More relaxed condition for showing text - show if note is reasonably sized
-            if width >= 25 and height >= 12:  # Simple size check instead of complex text fitting
-                painter.drawText(note_content_rect, Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter, corrected_label_name_note)
+            # Note labels - only collected when the note is reasonably sized, so small notes
+            # cost no text work at all
+            if has_label:  # Simple size check instead of complex text fitting
+                labels.append((QRectF(x_pos, y_pos, width, height), NOTE_NAMES[pitch]))
+        # Gradient fill and border in one drawRects call per bucket; the cached brushes are
+        # relative to each rect, so every note still gets its own gradient
+        for gradient_brush, rects in zip(gradient_brushes, gradient_rects):
+            if rects:
+                painter.setBrush(gradient_brush)
+                painter.drawRects(rects)
+        for flat_brush, rects in zip(flat_brushes, flat_rects):
+            if rects:
+                painter.setBrush(flat_brush)
+                painter.drawRects(rects)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+
+        # Use high contrast color for note labels - white with some transparency for visibility
+        painter.setPen(label_pen)
+        for note_content_rect, label in labels:
+            painter.drawText(note_content_rect, Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter, label)
     
     def _draw_playhead_no_piano_offset(self, painter):
         """Draw playhead without piano key offset"""
-        playhead_x = self.playhead_position * self.time_scale  # No WHITE_KEY_WIDTH offset
-        playhead_line = QPen(theme.PLAYHEAD_COLOR, 2)
-        painter.setPen(playhead_line)
-        painter.drawLine(int(playhead_x), 0, int(playhead_x), self.height())
+        playhead_x = int(self.playhead_position * self.time_scale)  # No WHITE_KEY_WIDTH offset
+        pens, fonts, brushes = paint_cache()
+        painter.setPen(pens['playhead'])
+        painter.drawLine(playhead_x, 0, playhead_x, self.height())
         
         # Draw playhead triangle at top
         triangle_size = 8
-        triangle_points = [
-            QPoint(int(playhead_x), 0),
-            QPoint(int(playhead_x - triangle_size//2), triangle_size),
-            QPoint(int(playhead_x + triangle_size//2), triangle_size)
-        ]
-        painter.setBrush(QBrush(theme.PLAYHEAD_COLOR))
+        painter.setBrush(brushes['playhead'])
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawPolygon(triangle_points)
+        painter.drawPolygon(playhead_triangle(triangle_size//2, triangle_size).translated(playhead_x, 0))
     
     def _pixel_to_time(self, x_pos: int) -> float:
         # No WHITE_KEY_WIDTH offset since we don't have piano keys
@@ -980,11 +1067,7 @@ class PianoRollNoteArea(PianoRollDisplay):
             super().wheelEvent(event)
     
     def calculate_total_width(self):
-        max_time = 0.0
-        if self.notes:
-            for note in self.notes:
-                if hasattr(note, 'end') and note.end > max_time:
-                    max_time = note.end
+        max_time = self.latest_note_end()
         min_visible_bars = 4
         min_time_from_bars = min_visible_bars * self.time_signature_numerator * (60.0 / self.bpm)
         self.total_time = max(max_time + 2.0, min_time_from_bars)
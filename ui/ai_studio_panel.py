@@ -2,6 +2,7 @@ import os
 import sys
 import tempfile
 import datetime
+import functools
 from pathlib import Path
 import random as random_module  # Explicit import to avoid naming conflicts
 from PySide6.QtWidgets import (
@@ -14,6 +15,7 @@ from PySide6.QtCore import Qt, Signal, QSize, QThread, QTimer, QUrl
 from PySide6.QtGui import QFont, QIcon, QPixmap, QDesktopServices, QCursor, QColor
 
 from ui.custom_widgets import ModernButton, ModernSlider
+from ui.widget_styles import GLOBAL_QSS
 from config import theme
 
 # AI dependencies should already be set up by utils.ensure_ai_dependencies() in app.py
@@ -71,6 +73,29 @@ print(f"   AI_AVAILABLE: {AI_AVAILABLE}")
 print(f"   TMIDIX_AVAILABLE: {TMIDIX_AVAILABLE}")
 print(f"   TRANSFORMER_AVAILABLE: {TRANSFORMER_AVAILABLE}")
 
+# Key and scale choices shown in the Musical Settings combos. Combo items carry the
+# pitch class / scale index as item data so generation never has to parse the text.
+SCALE_ROOTS = (
+    ("A", 9), ("A#", 10), ("B", 11), ("C", 0), ("C#", 1), ("D", 2),
+    ("D#", 3), ("E", 4), ("F", 5), ("F#", 6), ("G", 7), ("G#", 8)
+)
+SCALE_TYPES = ("Major", "Minor", "Dorian", "Mixolydian", "Lydian", "Phrygian")
+
+def _load_checkpoint(path):
+    """Read a .pth state dict from disk, reusing the last read while the file is unchanged"""
+    # Keyed on the modification time too, so a re-downloaded checkpoint is read again
+    return _read_checkpoint(path, os.path.getmtime(path))
+
+@functools.lru_cache(maxsize=1)
+def _read_checkpoint(path, mtime):
+    """Read a .pth state dict fully into memory; only the latest is kept"""
+    # Not memory-mapped: the cached dict would keep the mapping open for as long as it is
+    # cached, and on Windows a mapped file can't be overwritten or deleted
+    return torch.load(path, map_location='cpu')
+
+# Drops the cached state dict (e.g. when the model is unloaded)
+_load_checkpoint.cache_clear = _read_checkpoint.cache_clear
+
 class RealAIGenerator:
     """Real AI MIDI Generator with dynamic model parameter support"""
     
@@ -79,6 +104,7 @@ class RealAIGenerator:
         self.SEQ_LEN = 194
         self.PAD_IDX = 386
         self.model = None
+        self._eager_net = None  # Uncompiled transformer, kept so generation can fall back to it
         self.device = 'auto'
         self.ctx = None
         self.model_loaded = False
@@ -105,6 +131,10 @@ class RealAIGenerator:
                 print(f"⚠️ Error detecting device capabilities: {e}")
                 print("ℹ️ Falling back to CPU")
                 self.device = 'cpu'
+        
+        # Continuations sampled per generation in one batched pass. On GPU the per-token
+        # launch overhead dominates, so extra candidates are nearly free; on CPU they aren't.
+        self.num_candidates = 4 if self.device == 'cuda' else 1
     
     def get_available_models(self):
         """Get list of available .pth model files"""
@@ -179,11 +209,8 @@ class RealAIGenerator:
             pad_value=self.PAD_IDX
         )
         
-        # Load weights
-        if self.device == 'cpu':
-            self.model.load_state_dict(torch.load(model_path, map_location='cpu'))
-        else:
-            self.model.load_state_dict(torch.load(model_path))
+        # Load weights (cached per path, moved to the target device below)
+        self.model.load_state_dict(_load_checkpoint(model_path))
         
         self.model.to(self.device)
         self.model.eval()
@@ -210,6 +237,9 @@ class RealAIGenerator:
                 
             print(f"✅ Model parameters: SEQ_LEN={self.SEQ_LEN}, PAD_IDX={self.PAD_IDX}")
             
+            if not getattr(self.model.net, 'can_cache_kv', False):
+                print("⚠️ Model does not support KV caching, prefix will be recomputed every step")
+            
         except Exception as e:
             print(f"⚠️ Could not detect dynamic parameters, using defaults: {e}")
             print(f"ℹ️ Using default parameters: SEQ_LEN={self.SEQ_LEN}, PAD_IDX={self.PAD_IDX}")
@@ -235,13 +265,49 @@ class RealAIGenerator:
             # Create a dummy context manager that does nothing
             self.ctx = torch.amp.autocast(device_type='cpu', enabled=False)
         
+        self._compile_model()
+        
         self.model_loaded = True
     
+    def _compile_model(self):
+        """Wrap the transformer in torch.compile and warm it up so the first generation doesn't pay the compile cost"""
+        self._eager_net = self.model.net
+        if not hasattr(torch, 'compile'):
+            return
+        
+        try:
+            # Compile the inner network: generate() calls self.net once per sampled token.
+            # No CUDA graphs: the KV cache grows every step, so graphs would be re-recorded
+            # per length and their reused output buffers would be overwritten between steps
+            self.model.net = torch.compile(self._eager_net, mode='max-autotune-no-cudagraphs', dynamic=True)
+            
+            # Compilation is lazy, so run a short generation here the same way generate_tokens
+            # does (KV cache, batched candidates); the cached steps see a growing length, which
+            # settles the dynamic shapes. This also surfaces missing backends (e.g. no
+            # Triton/C++ toolchain) while we can still fall back
+            warmup_prime = torch.LongTensor([384, 0, 128 + 10, 256 + 60]).to(self.device)
+            warmup_prime = warmup_prime.unsqueeze(0).repeat(self.num_candidates, 1)
+            with torch.inference_mode(), self.ctx:
+                self.model.generate(warmup_prime, 8, eos_token=385, cache_kv=True, verbose=False)
+            print("✅ Model compiled with torch.compile")
+        except Exception as e:
+            print(f"⚠️ torch.compile unavailable, using eager model: {e}")
+            self.model.net = self._eager_net
+    
+    def _use_eager_model(self):
+        """Swap the compiled transformer back to the eager one; returns False if it already was"""
+        if self._eager_net is None or self.model.net is self._eager_net:
+            return False
+        self.model.net = self._eager_net
+        return True
+    
     def unload_model(self):
         """Unload the current model and free memory"""
         if self.model_loaded:
-            # Clear model references
+            # Clear model references, including the cached state dict
             self.model = None
+            self._eager_net = None
+            _load_checkpoint.cache_clear()
             self.ctx = None
             self.model_loaded = False
             self.current_model_path = None
@@ -360,7 +426,8 @@ class RealAIGenerator:
         return score
     
     def generate_tokens(self, mode='from_seed', seed_tokens=None, temperature=0.9, 
-                       seed_length=16, prime_duration=10, prime_pitch=72):
+                       seed_length=16, prime_duration=10, prime_pitch=72, seed=None,
+                       step_callback=None):
         """Generate tokens using the model"""
         if not self.model_loaded:
             raise RuntimeError("Model not loaded")
@@ -379,18 +446,49 @@ class RealAIGenerator:
         
         tokens_to_generate = self.SEQ_LEN - x.shape[0]
         
-        # Generate tokens
-        with self.ctx:
-            output = self.model.generate(
+        # Stack copies of the prompt so all candidates are sampled by the same forward calls
+        x = x.unsqueeze(0).repeat(self.num_candidates, 1)
+        
+        try:
+            output, log_probs = self._generate(x, tokens_to_generate, temperature, seed, step_callback)
+        except Exception as e:
+            # A compiled network can still fail on a shape or op the warmup didn't reach
+            if not self._use_eager_model():
+                raise
+            print(f"⚠️ Compiled model failed during generation, retrying with the eager model: {e}")
+            output, log_probs = self._generate(x, tokens_to_generate, temperature, seed, step_callback)
+        
+        # Keep the candidate the model found most likely (summed log-probs of its sampled tokens);
+        # with a single candidate this is simply row 0
+        best = int(log_probs.argmax())
+        return output[best].tolist()
+    
+    def _generate(self, x, tokens_to_generate, temperature, seed, step_callback):
+        """Run one batched sampling pass over the prompt rows in x; returns (tokens, summed log-probs) per row"""
+        # A seeded generator lets the sampler draw all of its noise up front on the model's
+        # device; it is created per pass so a retry samples the same sequence
+        generator = None
+        if seed:
+            generator = torch.Generator(device=self.device)
+            generator.manual_seed(seed)
+        
+        # Generate tokens. With cache_kv the prime/reference prefix is encoded once on the
+        # first step and each later step only feeds the newest token through the layers.
+        # inference_mode also skips the version-counter/view tracking that no_grad keeps;
+        # self.ctx applies bf16/fp16 autocast on CUDA/MPS (weights stay in fp32).
+        with torch.inference_mode(), self.ctx:
+            return self.model.generate(
                 x,
                 tokens_to_generate,
                 temperature=temperature,
                 eos_token=385,
+                cache_kv=True,
                 return_prime=True,
-                verbose=False
+                verbose=False,
+                generator=generator,
+                step_callback=step_callback,
+                return_log_probs=True
             )
-        
-        return output.tolist()
     
     def tokens_to_notes(self, tokens):
         """Convert tokens to pretty_midi notes"""
@@ -419,6 +517,27 @@ class RealAIGenerator:
         
         return notes
 
+class AIModelLoadWorker(QThread):
+    """Worker thread for loading (and compiling) the AI model to keep UI responsive"""
+    
+    # Signals to communicate with the main thread
+    loaded = Signal()            # Emitted when the model is ready to generate
+    error = Signal(object, str)  # Emitted with the exception and its formatted traceback
+    
+    def __init__(self, ai_generator, model_path):
+        super().__init__()
+        self.ai_generator = ai_generator
+        self.model_path = model_path
+    
+    def run(self):
+        """Load the model in background thread"""
+        try:
+            self.ai_generator.load_model(self.model_path)
+            self.loaded.emit()
+        except Exception as e:
+            import traceback
+            self.error.emit(e, traceback.format_exc())
+
 class AIGenerationWorker(QThread):
     """Worker thread for AI generation to keep UI responsive"""
     
@@ -426,6 +545,7 @@ class AIGenerationWorker(QThread):
     finished = Signal(list)  # Emitted when generation is complete with notes
     error = Signal(str)      # Emitted when an error occurs
     progress = Signal(str)   # Emitted for progress updates
+    percent = Signal(int)    # Emitted with overall progress (0-100) when it changes
     
     def __init__(self, ai_generator, generation_mode, scale_root, scale_type, creativity, 
                  reference_length, existing_notes, use_piano_roll_input, seed_value, randomize_seed):
@@ -440,6 +560,17 @@ class AIGenerationWorker(QThread):
         self.use_piano_roll_input = use_piano_roll_input
         self.seed_value = seed_value
         self.randomize_seed = randomize_seed
+        self._last_percent = -1
+    
+    def _emit_percent(self, value):
+        """Emit overall progress, skipping repeats so the bar only repaints on whole-percent changes"""
+        if value != self._last_percent:
+            self._last_percent = value
+            self.percent.emit(value)
+    
+    def _on_generation_step(self, step, total_steps):
+        """Map sampling steps onto the 10-90% band of the progress bar"""
+        self._emit_percent(10 + (80 * step) // max(1, total_steps))
     
     def run(self):
         """Run the AI generation in background thread"""
@@ -453,15 +584,18 @@ class AIGenerationWorker(QThread):
                 return
             
             self.progress.emit("Converting parameters...")
+            self._emit_percent(0)
             
             # Convert musician-friendly parameters to AI model parameters
             ai_params = self._convert_to_ai_parameters()
             
             self.progress.emit("Generating melody with AI...")
+            self._emit_percent(10)
             
             # Generate using real AI model
             generated_notes = self._generate_with_ai(ai_params)
             
+            self._emit_percent(100)
             self.progress.emit("Generation complete!")
             self.finished.emit(generated_notes)
         except Exception as e:
@@ -484,15 +618,8 @@ class AIGenerationWorker(QThread):
         # Convert creativity to temperature
         temperature = 0.5 + (self.creativity / 100.0) * 1.0  # Maps 0-100 to 0.5-1.5
         
-        # Convert scale to prime note (for prime_note mode)
-        scale_to_midi = {
-            "C": 60, "C#": 61, "D": 62, "D#": 63, "E": 64, "F": 65,
-            "F#": 66, "G": 67, "G#": 68, "A": 69, "A#": 70, "B": 71
-        }
-        
-        prime_pitch = scale_to_midi.get(self.scale_root, 60)
-        if self.scale_type == "Minor":
-            prime_pitch = prime_pitch  # Keep the same root note for minor
+        # Convert scale root (pitch class) to a prime note in the middle-C octave (for prime_note mode)
+        prime_pitch = 60 + self.scale_root
         
         prime_duration = 10  # Default duration for prime note
         
@@ -532,7 +659,9 @@ class AIGenerationWorker(QThread):
             temperature=ai_params["temperature"],
             seed_length=ai_params["seed_length"],
             prime_duration=ai_params["prime_duration"],
-            prime_pitch=ai_params["prime_pitch"]
+            prime_pitch=ai_params["prime_pitch"],
+            seed=ai_params["seed"],
+            step_callback=self._on_generation_step
         )
         
         # Convert tokens back to notes
@@ -560,7 +689,9 @@ class AIStudioPanel(QDockWidget):
         
         self.dock_content = QWidget()
         self.setWidget(self.dock_content)
-        self.dock_content.setStyleSheet(f"background-color: {theme.PANEL_BG_COLOR.name()};")
+        # The panel background applies to every child, so the custom widget rules are
+        # repeated here to keep buttons/sliders from inheriting the flat panel color
+        self.dock_content.setStyleSheet(f"* {{ background-color: {theme.PANEL_BG_COLOR.name()}; }}" + GLOBAL_QSS)
         
         main_layout = QVBoxLayout(self.dock_content)
         main_layout.setContentsMargins(theme.PADDING_L, theme.PADDING_L, theme.PADDING_L, theme.PADDING_L)
@@ -573,6 +704,7 @@ class AIStudioPanel(QDockWidget):
         self.current_notes = []
         self.generation_worker = None
         self.generation_in_progress = False
+        self.model_load_worker = None
         
         self._setup_model_section(main_layout)
         self._setup_input_source_section(main_layout)
@@ -772,12 +904,14 @@ class AIStudioPanel(QDockWidget):
         scale_layout.addWidget(QLabel("Key:"))
         
         self.scale_root_combo = QComboBox()
-        self.scale_root_combo.addItems(["A", "A#", "B", "C", "C#", "D", "D#", "E", "F", "F#", "G", "G#"])
+        for root_name, pitch_class in SCALE_ROOTS:
+            self.scale_root_combo.addItem(root_name, pitch_class)
         self.scale_root_combo.setCurrentText("C")
         scale_layout.addWidget(self.scale_root_combo)
         
         self.scale_type_combo = QComboBox()
-        self.scale_type_combo.addItems(["Major", "Minor", "Dorian", "Mixolydian", "Lydian", "Phrygian"])
+        for scale_index, scale_name in enumerate(SCALE_TYPES):
+            self.scale_type_combo.addItem(scale_name, scale_index)
         self.scale_type_combo.setCurrentText("Major")
         scale_layout.addWidget(self.scale_type_combo)
         
@@ -1157,27 +1291,36 @@ class AIStudioPanel(QDockWidget):
     
     def _load_model(self):
         """Load the AI model"""
+        if self.model_load_worker is not None and self.model_load_worker.isRunning():
+            return
+        
+        # Get selected model path
+        selected_model_data = self.model_combo.currentData()
+        if not selected_model_data:
+            # Fallback to first available model
+            selected_model_data = None
+        
+        self.load_model_button.setEnabled(False)
+        self.load_model_button.setText("Loading...")
+        self.model_info_label.setText("Loading model...")
+        self.device_info_label.setText("Initializing device...")
+        
+        # Add detailed debugging
+        print("🔍 DEBUG: Starting model loading...")
+        print(f"🔍 DEBUG: Selected model: {selected_model_data}")
+        print(f"🔍 DEBUG: AI dependencies available - TMIDIX: {TMIDIX_AVAILABLE}")
+        print(f"🔍 DEBUG: AI dependencies available - Transformer: {TRANSFORMER_AVAILABLE}")
+        
+        # Load the selected model in a worker thread: reading the weights and the
+        # torch.compile warmup can take a long time
+        self.model_load_worker = AIModelLoadWorker(self.ai_generator, selected_model_data)
+        self.model_load_worker.loaded.connect(self._on_model_loaded)
+        self.model_load_worker.error.connect(self._on_model_load_error)
+        self.model_load_worker.start()
+    
+    def _on_model_loaded(self):
+        """Handle model loading completion"""
         try:
-            # Get selected model path
-            selected_model_data = self.model_combo.currentData()
-            if not selected_model_data:
-                # Fallback to first available model
-                selected_model_data = None
-            
-            self.load_model_button.setEnabled(False)
-            self.load_model_button.setText("Loading...")
-            self.model_info_label.setText("Loading model...")
-            self.device_info_label.setText("Initializing device...")
-            
-            # Add detailed debugging
-            print("🔍 DEBUG: Starting model loading...")
-            print(f"🔍 DEBUG: Selected model: {selected_model_data}")
-            print(f"🔍 DEBUG: AI dependencies available - TMIDIX: {TMIDIX_AVAILABLE}")
-            print(f"🔍 DEBUG: AI dependencies available - Transformer: {TRANSFORMER_AVAILABLE}")
-            
-            # Load the selected model
-            self.ai_generator.load_model(selected_model_data)
-            
             # Update UI with success info
             model_name = self.ai_generator.current_model_name
             device_info = self._get_device_display_name(self.ai_generator.device)
@@ -1251,7 +1394,13 @@ class AIStudioPanel(QDockWidget):
             
             print("✅ DEBUG: Model loaded successfully!")
             
-        except ImportError as e:
+        except Exception as e:
+            import traceback
+            self._on_model_load_error(e, traceback.format_exc())
+    
+    def _on_model_load_error(self, e, details):
+        """Handle model loading errors"""
+        if isinstance(e, ImportError):
             error_msg = f"Missing dependency: {e}"
             print(f"❌ DEBUG: Import error during model loading: {e}")
             
@@ -1271,7 +1420,7 @@ class AIStudioPanel(QDockWidget):
             self.model_info_label.setStyleSheet(f"color: {theme.SECONDARY_TEXT_COLOR.name()};")
             self.device_info_label.setText("Device: Error during initialization")
             
-        except FileNotFoundError as e:
+        elif isinstance(e, FileNotFoundError):
             error_msg = f"Model file not found: {e}"
             print(f"❌ DEBUG: File not found during model loading: {e}")
             
@@ -1291,18 +1440,17 @@ class AIStudioPanel(QDockWidget):
             self.model_info_label.setStyleSheet(f"color: {theme.SECONDARY_TEXT_COLOR.name()};")
             self.device_info_label.setText("Device: Model loading failed")
             
-        except Exception as e:
+        else:
             error_msg = f"Unknown error: {e}"
             print(f"❌ DEBUG: Unknown error during model loading: {e}")
-            import traceback
-            print(f"❌ DEBUG: Full traceback:\n{traceback.format_exc()}")
+            print(f"❌ DEBUG: Full traceback:\n{details}")
             
             # Show generic error dialog with full details
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Critical)
             msg.setWindowTitle("Model Loading Error")
             msg.setText(f"Failed to load model:\n\n{e}")
-            msg.setDetailedText(f"Full error details:\n{traceback.format_exc()}")
+            msg.setDetailedText(f"Full error details:\n{details}")
             msg.exec()
             
             # Reset UI
@@ -1356,8 +1504,8 @@ class AIStudioPanel(QDockWidget):
         else:
             generation_mode = "Start Fresh"
         
-        scale_root = self.scale_root_combo.currentText()
-        scale_type = self.scale_type_combo.currentText()
+        scale_root = self.scale_root_combo.currentData()
+        scale_type = self.scale_type_combo.currentData()
         creativity = self.creativity_slider.value()
         reference_length = self.ref_length_spinbox.value()
         use_piano_roll_input = self.use_piano_roll_checkbox.isChecked()
@@ -1373,11 +1521,15 @@ class AIStudioPanel(QDockWidget):
         self.generation_worker.finished.connect(self._on_generation_finished)
         self.generation_worker.error.connect(self._on_generation_error)
         self.generation_worker.progress.connect(self._on_generation_progress)
+        self.generation_worker.percent.connect(self.progress_bar.setValue)
         
         self.generation_in_progress = True
         self.generate_button.setEnabled(False)
         self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)  # Indeterminate progress
+        # Determinate bar driven by the worker; an indeterminate (0, 0) range would
+        # keep the main thread repainting the busy animation for the whole generation
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
         
         self.generation_worker.start()
     
@@ -1409,13 +1561,17 @@ class AIStudioPanel(QDockWidget):
     
     def _clear_notes(self):
         """Clear all notes"""
-        self.notesGenerated.emit([])  # Emit empty list to clear notes
+        # Nothing to clear: skip the round trip through the main window and piano roll redraw
+        if self.current_notes:
+            self.notesGenerated.emit([])  # Emit empty list to clear notes
         self.status_label.setText("Notes cleared")
     
     def set_current_notes(self, notes):
         """Update current notes for reference"""
-        self.current_notes = notes
-        note_count = len(notes) if notes else 0
+        # Keep a reference to the caller's list; no copy is needed since we only read it
+        if notes is not self.current_notes:
+            self.current_notes = notes if notes is not None else []
+        note_count = len(self.current_notes)
         if note_count > 0:
             self.status_label.setText(f"Ready - {note_count} notes loaded")
         else:
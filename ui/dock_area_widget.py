@@ -7,7 +7,7 @@ of the piano roll state, ensuring consistent docking behavior for floating panel
 
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QPainter, QDragEnterEvent, QDragMoveEvent, QDropEvent
+from PySide6.QtGui import QPainter, QColor, QDragEnterEvent, QDragMoveEvent, QDropEvent
 
 try:
     from config import theme
@@ -55,13 +55,15 @@ class DockAreaWidget(QWidget):
         # Set tool tip for debugging
         self.setToolTip(f"Dock Area Zone ({edge_position.title()})")
         
-        # Make it invisible but functional
-        self.setStyleSheet("""
-            QWidget {
-                background-color: transparent;
-                border: none;
-            }
-        """)
+        # Make it invisible but functional - no stylesheet, so Qt never has to
+        # parse/polish one for these zones; debug visuals are painted directly
+        self.setAutoFillBackground(False)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        # Contents never depend on size, so a resize (every time the window height
+        # changes) only exposes the newly uncovered area instead of the whole zone
+        self.setAttribute(Qt.WA_StaticContents, True)
+        self._debug = False
     
     def sizeHint(self):
         """Provide size hint for the layout system."""
@@ -75,13 +77,15 @@ class DockAreaWidget(QWidget):
         """
         Paint the widget. Normally invisible, but can be made visible for debugging.
         """
-        painter = QPainter(self)
-        
-        # For debugging purposes, uncomment the line below to make the dock zones visible
-        # painter.fillRect(self.rect(), QColor(255, 0, 0, 50))  # Semi-transparent red
+        # Normally, draw nothing at all - the zone is transparent without touching any pixels
+        if not self._debug:
+            return
         
-        # Normally, draw nothing (transparent)
-        painter.fillRect(self.rect(), Qt.transparent)
+        # Semi-transparent red zone with a red outline
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(255, 0, 0, 50))
+        painter.setPen(QColor(255, 0, 0))
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
     
     def dragEnterEvent(self, event: QDragEnterEvent):
         """
@@ -129,20 +133,9 @@ class DockAreaWidget(QWidget):
         Args:
             enable (bool): Whether to show the dock area visually
         """
-        if enable:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: rgba(255, 0, 0, 50);
-                    border: 1px solid red;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: transparent;
-                    border: none;
-                }
-            """)
+        if self._debug == enable:
+            return
+        self._debug = enable
         self.update()
 
 
@@ -170,6 +163,10 @@ class DockAreaManager:
         Args:
             parent_layout: The layout to add dock areas to (typically QHBoxLayout)
         """
+        # Hold repaints until both zones are in place so the window updates once
+        updates_were_enabled = self.main_window.updatesEnabled()
+        self.main_window.setUpdatesEnabled(False)
+
         # Create left dock area
         self.left_dock_area = DockAreaWidget("left", self.main_window)
         parent_layout.insertWidget(0, self.left_dock_area)  # Insert at beginning
@@ -178,10 +175,11 @@ class DockAreaManager:
         self.right_dock_area = DockAreaWidget("right", self.main_window)
         parent_layout.addWidget(self.right_dock_area)  # Add at end
         
-        # Ensure the dock areas have proper properties for Qt's docking system
-        for dock_area in [self.left_dock_area, self.right_dock_area]:
-            dock_area.setAcceptDrops(True)
-            dock_area.raise_()  # Bring to front for better detection
+        # Bring to front for better detection (drops are already accepted in DockAreaWidget)
+        self.left_dock_area.raise_()
+        self.right_dock_area.raise_()
+
+        self.main_window.setUpdatesEnabled(updates_were_enabled)
         
         print("Dock area widgets created and integrated into layout")
     
@@ -1,6 +1,9 @@
-from PySide6.QtCore import Qt, QRect, QPoint, QRectF
-from PySide6.QtGui import QColor, QPen, QBrush, QLinearGradient, QFont, QRadialGradient, QFontMetrics
+from PySide6.QtCore import Qt, QRect, QPoint, QPointF, QRectF, QLine
+from PySide6.QtGui import QColor, QPen, QBrush, QLinearGradient, QGradient, QFont, QRadialGradient, QFontMetrics, QFontMetricsF, QPainter, QPixmap, QPolygon, QStaticText
+import math
+
 import pretty_midi
+import numpy as np
 
 from config.constants import (
     MIN_PITCH, MAX_PITCH, WHITE_KEY_WIDTH, BLACK_KEY_WIDTH,
@@ -9,49 +12,238 @@ from config.constants import (
 )
 from config import theme # Updated to import the whole module
 
-# Assuming these are defined in theme.py (if not, they will be added later)
-# For now, using fallbacks if specific names are not yet in the imported theme object.
-# PIANO_KEY_WHITE_COLOR = getattr(theme, 'PIANO_KEY_WHITE_COLOR', theme.WHITE_KEY_COLOR) # Already exists
-# PIANO_KEY_BLACK_COLOR = getattr(theme, 'PIANO_KEY_BLACK_COLOR', theme.BLACK_KEY_COLOR) # Already exists
-# PIANO_KEY_BORDER_COLOR = getattr(theme, 'PIANO_KEY_BORDER_COLOR', theme.KEY_BORDER_COLOR) # Already exists
-# PIANO_KEY_LABEL_COLOR = getattr(theme, 'PIANO_KEY_LABEL_COLOR', theme.PRIMARY_TEXT_COLOR.darker(150)) # Example fallback
-# PIANO_KEY_BLACK_LABEL_COLOR = getattr(theme, 'PIANO_KEY_BLACK_LABEL_COLOR', theme.PRIMARY_TEXT_COLOR.lighter(150)) # Example fallback
-# NOTE_LABEL_COLOR = getattr(theme, 'NOTE_LABEL_COLOR', QColor(0,0,0,180)) # Example fallback
-# PLAYHEAD_TRIANGLE_COLOR = getattr(theme, 'PLAYHEAD_TRIANGLE_COLOR', theme.PLAYHEAD_COLOR) # Example fallback
-# PIANO_KEY_SEPARATOR_COLOR = getattr(theme, 'PIANO_KEY_SEPARATOR_COLOR', theme.BORDER_COLOR_NORMAL) # Example fallback
+# Optional theme colors resolved once, not per paint. theme.py defines all of them today;
+# the fallbacks only cover older theme modules. refresh_theme_cache() re-resolves them
+_THEME_COLORS = {}
+
+def _resolve_theme_colors():
+    _THEME_COLORS['piano_key_label'] = getattr(theme, 'PIANO_KEY_LABEL_COLOR', None) or theme.PRIMARY_TEXT_COLOR.darker(180) # Darker text for light keys
+    _THEME_COLORS['piano_key_black_label'] = getattr(theme, 'PIANO_KEY_BLACK_LABEL_COLOR', None) or theme.PRIMARY_TEXT_COLOR.lighter(180) # Lighter text for dark keys
+    _THEME_COLORS['piano_key_separator'] = getattr(theme, 'PIANO_KEY_SEPARATOR_COLOR', None) or theme.BORDER_COLOR_NORMAL
+    _THEME_COLORS['playhead_triangle'] = getattr(theme, 'PLAYHEAD_TRIANGLE_COLOR', None) or theme.PLAYHEAD_COLOR
+
+_resolve_theme_colors()
+
+# Pens and fonts reused by every paint; filled on first use so no Qt paint
+# objects are created before the QApplication exists
+_PENS = {}
+_FONTS = {}
+_BRUSHES = {}
+# Note fill brushes for the low/medium/high velocity buckets
+_NOTE_BRUSHES = []
+
+def _object_gradient_brush(*stops):
+    """Vertical gradient brush whose stops are relative to each filled shape's bounding rect."""
+    gradient = QLinearGradient(0, 0, 0, 1)
+    gradient.setCoordinateMode(QGradient.CoordinateMode.ObjectBoundingMode)
+    for position, color in stops:
+        gradient.setColorAt(position, color)
+    return QBrush(gradient)
+
+def _init_paint_cache():
+    _PENS['row_line'] = QPen(theme.KEY_GRID_LINE_COLOR, 0.8, Qt.PenStyle.SolidLine) # Subtle width
+    _PENS['sixteenth_line'] = QPen(theme.GRID_LINE_COLOR, 0.5, Qt.PenStyle.DotLine) # Very faint
+    _PENS['beat_line'] = QPen(theme.GRID_BEAT_LINE_COLOR, 0.7, Qt.PenStyle.SolidLine)
+    _PENS['measure_line'] = QPen(theme.GRID_MEASURE_LINE_COLOR, 1.0, Qt.PenStyle.SolidLine) # Slightly more prominent
+    _PENS['grid_text'] = QPen(theme.SECONDARY_TEXT_COLOR, 1.0)
+    # Using BORDER_COLOR_NORMAL for a standard separator
+    _PENS['key_separator'] = QPen(_THEME_COLORS['piano_key_separator'], 1.0)
+    _FONTS['time_signature'] = QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_S, weight=theme.FONT_WEIGHT_BOLD)
+    _FONTS['measure_number'] = QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_XS)
+    _BRUSHES['row_highlight'] = QBrush(theme.GRID_ROW_HIGHLIGHT_COLOR)
+    _PENS['key_border'] = QPen(theme.KEY_BORDER_COLOR, 0.5) # Thin border
+    _FONTS['key_label'] = QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_M, weight=theme.FONT_WEIGHT_BOLD) # Bigger, bolder font
+    _BRUSHES['white_key'] = _object_gradient_brush((0.0, theme.WHITE_KEY_COLOR.lighter(105)), (1.0, theme.WHITE_KEY_COLOR.darker(102)))
+    # Black keys get less intense gradient
+    _BRUSHES['black_key'] = _object_gradient_brush((0.0, theme.BLACK_KEY_COLOR.lighter(115)), (1.0, theme.BLACK_KEY_COLOR))
+    _PENS['note_border'] = QPen(theme.NOTE_BORDER_COLOR, 0.5) # Subtle
+    # High contrast note labels - bright white with high opacity, bold for visibility
+    _PENS['note_label'] = QPen(QColor(255, 255, 255, 220))
+    _FONTS['note_label'] = QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_S, weight=theme.FONT_WEIGHT_BOLD)
+    _PENS['playhead'] = QPen(theme.PLAYHEAD_COLOR, 2)
+    _PENS['playhead_shadow'] = QPen(theme.PLAYHEAD_SHADOW_COLOR, 2)
+    _BRUSHES['playhead'] = QBrush(theme.PLAYHEAD_COLOR)
+    _BRUSHES['playhead_shadow'] = QBrush(theme.PLAYHEAD_SHADOW_COLOR)
+    _BRUSHES['playhead_triangle'] = QBrush(_THEME_COLORS['playhead_triangle'])
+    # Note area (PianoRollNoteArea) draws square notes with a stronger border and a two-stop gradient
+    _PENS['note_area_border'] = QPen(theme.NOTE_BORDER_COLOR, 1.0)
+    _BRUSHES['note_area_low'] = _object_gradient_brush((0.0, theme.NOTE_LOW_COLOR.lighter(120)), (1.0, theme.NOTE_LOW_COLOR))
+    _BRUSHES['note_area_med'] = _object_gradient_brush((0.0, theme.NOTE_MED_COLOR.lighter(120)), (1.0, theme.NOTE_MED_COLOR))
+    _BRUSHES['note_area_high'] = _object_gradient_brush((0.0, theme.NOTE_HIGH_COLOR.lighter(120)), (1.0, theme.NOTE_HIGH_COLOR))
+    # Solid fills for notes too small for their gradient to be visible
+    _BRUSHES['note_low_flat'] = QBrush(theme.NOTE_LOW_COLOR)
+    _BRUSHES['note_med_flat'] = QBrush(theme.NOTE_MED_COLOR)
+    _BRUSHES['note_high_flat'] = QBrush(theme.NOTE_HIGH_COLOR)
+    _NOTE_BRUSHES.clear()
+    for color in (theme.NOTE_LOW_COLOR, theme.NOTE_MED_COLOR, theme.NOTE_HIGH_COLOR):
+        # Stops are relative to each note's bounding rect, so one gradient serves every note
+        _NOTE_BRUSHES.append(_object_gradient_brush((0, color.lighter(130)), (0.5, color), (1, color.darker(110))))
+
+def paint_cache():
+    """Shared (pens, fonts, brushes) dicts for piano-roll painting, built on first use."""
+    if not _PENS:
+        _init_paint_cache()
+    return _PENS, _FONTS, _BRUSHES
+
+
+# Smallest note block (px) that gets a name label drawn inside it
+NOTE_LABEL_MIN_WIDTH = 25
+NOTE_LABEL_MIN_HEIGHT = 12
+# Note blocks narrower or shorter than this (px) get a flat fill and square corners;
+# neither the gradient nor the rounding is visible at that size
+FLAT_NOTE_MAX_WIDTH = 12
+FLAT_NOTE_MAX_HEIGHT = 10
+
+# Per-MIDI-pitch lookup tables, so painting never formats names or tests pitch classes.
+# pretty_midi already gives the octave numbering used on the keys (C4 = 60, Middle C).
+# The public tables and pitch_y_tops() are shared with the note area in note_display
+NOTE_NAMES = tuple(pretty_midi.note_number_to_name(p) for p in range(128))
+IS_WHITE_KEY = tuple(p % 12 in (0, 2, 4, 5, 7, 9, 11) for p in range(128))
+IS_C_ROW = tuple(p % 12 == 0 for p in range(128))
+# Keyboard pitches split by key colour, so the key passes never test pitches they skip
+_WHITE_PITCHES = tuple(p for p in range(MIN_PITCH, MAX_PITCH + 1) if IS_WHITE_KEY[p])
+_BLACK_PITCHES = tuple(p for p in range(MIN_PITCH, MAX_PITCH + 1) if not IS_WHITE_KEY[p])
+# Array form of IS_WHITE_KEY for note_geometry(), which looks up whole pitch arrays at once
+_IS_WHITE_KEY_ARRAY = np.array(IS_WHITE_KEY)
+
+# Zoom steps are geometric, so bound the number of remembered factors
+_ZOOM_CACHE_LIMIT = 32
+
+# Row top y per MIDI pitch (index 0-127), keyed by vertical zoom factor. Kept as a plain
+# list because indexing it per note is cheaper than indexing a NumPy array
+_ytop_cache: dict[float, list[int]] = {}
+
+def pitch_y_tops(vertical_zoom_factor):
+    """Row top y for each MIDI pitch at the given vertical zoom, indexed by pitch."""
+    ytops = _ytop_cache.get(vertical_zoom_factor)
+    if ytops is None:
+        if len(_ytop_cache) >= _ZOOM_CACHE_LIMIT:
+            _ytop_cache.clear()
+        # Truncated like the int() casts it replaces, so rows stay on the same pixels
+        ytops = _ytop_cache[vertical_zoom_factor] = (
+            (MAX_PITCH - np.arange(128)) * (WHITE_KEY_HEIGHT * vertical_zoom_factor)
+        ).astype(np.int32).tolist()
+    return ytops
+
+# (row top y, is C row) per pitch from MAX_PITCH down, keyed by vertical zoom factor
+_grid_row_cache: dict[float, list[tuple[int, bool]]] = {}
+
+def _grid_rows(vertical_zoom_factor):
+    rows = _grid_row_cache.get(vertical_zoom_factor)
+    if rows is None:
+        if len(_grid_row_cache) >= _ZOOM_CACHE_LIMIT:
+            _grid_row_cache.clear()
+        ytops = pitch_y_tops(vertical_zoom_factor)
+        rows = _grid_row_cache[vertical_zoom_factor] = [
+            (ytops[pitch], IS_C_ROW[pitch]) for pitch in range(MAX_PITCH, MIN_PITCH - 1, -1)
+        ]
+    return rows
+
 
+# Laid-out grid labels (time signature, measure numbers) keyed by (font name, text), and
+# the ascent of each font they use; see draw_grid_text()
+_GRID_TEXT_CACHE_LIMIT = 1024
+_grid_text_cache: dict[tuple[str, str], QStaticText] = {}
+_grid_font_ascents: dict[str, float] = {}
 
-def draw_time_grid(painter, width, height, time_scale, bpm, time_signature_numerator, time_signature_denominator, parent_widget, vertical_zoom_factor=1.0):
-    """Draw the time grid with beats and measures and horizontal note lines"""
+def draw_grid_text(painter, x, baseline_y, text, font_name):
+    """
+    Same output as painter.drawText(x, baseline_y, text) with _FONTS[font_name] set on the
+    painter, but the text layout is kept between paints as a QStaticText.
+    """
+    key = (font_name, text)
+    static_text = _grid_text_cache.get(key)
+    if static_text is None:
+        if len(_grid_text_cache) >= _GRID_TEXT_CACHE_LIMIT:
+            _grid_text_cache.clear()
+        static_text = _grid_text_cache[key] = QStaticText(text)
+        static_text.setTextFormat(Qt.TextFormat.PlainText)
+    ascent = _grid_font_ascents.get(font_name)
+    if ascent is None:
+        ascent = _grid_font_ascents[font_name] = QFontMetricsF(_FONTS[font_name]).ascent()
+    # drawStaticText positions the top-left of the text, drawText its baseline
+    painter.drawStaticText(QPointF(x, baseline_y - ascent), static_text)
+
+# Measure numbers are drawn to the right of their line, so a line this far left of the
+# visible area can still have its number showing
+MEASURE_NUMBER_REACH = 40
+
+def visible_pitch_range(visible_rect, vertical_zoom_factor):
+    """(lowest, highest) pitch whose row overlaps visible_rect; the full range without a rect."""
+    effective_white_key_height = WHITE_KEY_HEIGHT * vertical_zoom_factor
+    if visible_rect is None or effective_white_key_height <= 0:
+        return MIN_PITCH, MAX_PITCH
+    highest_pitch = min(MAX_PITCH, MAX_PITCH - math.floor(visible_rect.top() / effective_white_key_height))
+    lowest_pitch = max(MIN_PITCH, MAX_PITCH - math.floor(visible_rect.bottom() / effective_white_key_height))
+    return lowest_pitch, highest_pitch
+
+def visible_line_positions(step, x_offset, left, right, count, skip_every=0):
+    """
+    Grid lines i < count at x = i * step + x_offset that fall within [left, right], as
+    (indices, xs) int lists. skip_every drops every n-th index (lines a coarser grid level draws).
+    """
+    first = max(0, math.ceil((left - x_offset) / step))
+    last = min(count - 1, math.floor((right - x_offset) / step))
+    indices = np.arange(first, last + 1)
+    if skip_every:
+        indices = indices[indices % skip_every != 0]
+    # Truncated like int(), so lines land on the same pixels as the per-line casts did
+    xs = (indices * step + x_offset).astype(np.int64)
+    return indices.tolist(), xs.tolist()
+
+def notes_in_view_range(note_index, visible_rect, time_scale, x_offset=WHITE_KEY_WIDTH):
+    """(lo, hi) slice bounds into a build_note_index() result for the notes that can reach visible_rect horizontally."""
+    sorted_notes, starts, longest_duration, note_arrays = note_index
+    t_min = (visible_rect.left() - x_offset) / time_scale
+    t_max = (visible_rect.right() - x_offset) / time_scale
+    # A note starting up to its duration (or the 4px minimum width) earlier can still reach t_min
+    reach = max(longest_duration, 4 / time_scale)
+    # starts is sorted, so both bounds are binary searches over the cached array
+    return int(np.searchsorted(starts, t_min - reach, side='left')), int(np.searchsorted(starts, t_max, side='right'))
+
+def draw_time_grid(painter, width, height, time_scale, bpm, time_signature_numerator, time_signature_denominator, viewport_y_offset=0, vertical_zoom_factor=1.0, visible_rect=None):
+    """Draw the time grid with beats and measures and horizontal note lines.
+
+    viewport_y_offset is the current vertical scroll value, supplied by the caller so the
+    time signature and measure numbers stay pinned to the top of the visible area.
+    When visible_rect is given, only the rows and lines that fall inside it are drawn.
+    """
     keyboard_width = WHITE_KEY_WIDTH # This constant is from config.constants, not theme
     
     effective_white_key_height = WHITE_KEY_HEIGHT * vertical_zoom_factor # WHITE_KEY_HEIGHT from config.constants
     
-    current_viewport_y_offset = 0
-    if parent_widget and hasattr(parent_widget, 'verticalScrollBar'):
-        current_viewport_y_offset = parent_widget.verticalScrollBar().value()
-    elif parent_widget and hasattr(parent_widget, 'parentWidget') and parent_widget.parentWidget():
-        grandparent_obj = parent_widget.parentWidget()
-        if grandparent_obj and hasattr(grandparent_obj, 'verticalScrollBar'):
-            current_viewport_y_offset = grandparent_obj.verticalScrollBar().value()
-    
+    if not _PENS:
+        _init_paint_cache()
+
+    if visible_rect is not None:
+        left, right = max(keyboard_width, visible_rect.left()), min(width, visible_rect.right() + 1)
+    else:
+        left, right = keyboard_width, width
+    lowest_pitch, highest_pitch = visible_pitch_range(visible_rect, vertical_zoom_factor)
+
+    # Every grid line is horizontal or vertical on whole pixels, so antialiasing buys nothing here
+    prev_antialiasing = painter.testRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+
     # Draw horizontal lines for note rows
-    painter.setPen(QPen(theme.KEY_GRID_LINE_COLOR, 0.8, Qt.PenStyle.SolidLine)) # Use new name, subtle width
-    for pitch in range(MIN_PITCH, MAX_PITCH + 1):
-        y_pos = (MAX_PITCH - pitch) * effective_white_key_height
-        painter.drawLine(keyboard_width, int(y_pos), width, int(y_pos))
-        note_name = pretty_midi.note_number_to_name(pitch)
-        if note_name.endswith('C') and '#' not in note_name:
-            highlight_rect = QRect(keyboard_width, int(y_pos), width - keyboard_width, int(effective_white_key_height))
-            painter.fillRect(highlight_rect, theme.GRID_ROW_HIGHLIGHT_COLOR)
+    # Rows run from MAX_PITCH down, so the visible pitch range is a contiguous slice
+    rows = _grid_rows(vertical_zoom_factor)[MAX_PITCH - highest_pitch:MAX_PITCH - lowest_pitch + 1]
+    painter.setPen(_PENS['row_line'])
+    painter.drawLines([QLine(left, y_pos, right, y_pos) for y_pos, _ in rows])
+    row_height = int(effective_white_key_height)
+    highlight_rects = [QRect(left, y_pos, right - left, row_height) for y_pos, is_c_row in rows if is_c_row]
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(_BRUSHES['row_highlight'])
+    painter.drawRects(highlight_rects)
+    painter.setBrush(Qt.BrushStyle.NoBrush)
 
     # Time signature display
     ts_text = f"{time_signature_numerator}/{time_signature_denominator}"
-    painter.setPen(QPen(theme.SECONDARY_TEXT_COLOR, 1.0))
-    painter.setFont(QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_S, weight=theme.FONT_WEIGHT_BOLD))
+    painter.setPen(_PENS['grid_text'])
+    painter.setFont(_FONTS['time_signature'])
     ts_x_pos = keyboard_width + theme.PADDING_S
-    ts_y_pos = current_viewport_y_offset + theme.PADDING_M + theme.FONT_SIZE_S # Adjusted for font size
-    painter.drawText(ts_x_pos, ts_y_pos, ts_text)
+    ts_y_pos = viewport_y_offset + theme.PADDING_M + theme.FONT_SIZE_S # Adjusted for font size
+    draw_grid_text(painter, ts_x_pos, ts_y_pos, ts_text, 'time_signature')
 
     actual_pixels_per_quarter_note = 0
     if bpm > 0:
@@ -59,214 +251,316 @@ def draw_time_grid(painter, width, height, time_scale, bpm, time_signature_numer
         actual_pixels_per_quarter_note = time_scale * seconds_per_quarter_note
     
     # Draw sixteenth note lines (very faint)
-    painter.setPen(QPen(theme.GRID_LINE_COLOR, 0.5, Qt.PenStyle.DotLine)) # Subtle width
+    painter.setPen(_PENS['sixteenth_line'])
     sixteenth_note_step_pixels = actual_pixels_per_quarter_note / 4.0 if actual_pixels_per_quarter_note > 0 else 0
     if sixteenth_note_step_pixels > 5: # Only draw if lines are reasonably spaced
-        for i in range(int(width / sixteenth_note_step_pixels) + 1):
-            if i % 4 != 0:
-                x = i * sixteenth_note_step_pixels + keyboard_width
-                painter.drawLine(int(x), 0, int(x), height)
+        # Every 4th sixteenth is a beat or measure line
+        _, sixteenth_xs = visible_line_positions(sixteenth_note_step_pixels, keyboard_width, left, right,
+                                                 int(width / sixteenth_note_step_pixels) + 1, skip_every=4)
+        painter.drawLines([QLine(x, 0, x, height) for x in sixteenth_xs])
 
     pixels_per_beat = actual_pixels_per_quarter_note * (4.0 / time_signature_denominator) if time_signature_denominator > 0 else actual_pixels_per_quarter_note
     
     # Draw beat lines (more visible than grid, less than measure)
     if pixels_per_beat > 0:
-        painter.setPen(QPen(theme.GRID_BEAT_LINE_COLOR, 0.7, Qt.PenStyle.SolidLine)) # Subtle width
-        for i in range(int(width / pixels_per_beat) + 1):
-            if i % time_signature_numerator != 0:
-                x = i * pixels_per_beat + keyboard_width
-                painter.drawLine(int(x), 0, int(x), height)
+        painter.setPen(_PENS['beat_line'])
+        _, beat_xs = visible_line_positions(pixels_per_beat, keyboard_width, left, right,
+                                            int(width / pixels_per_beat) + 1, skip_every=time_signature_numerator)
+        painter.drawLines([QLine(x, 0, x, height) for x in beat_xs])
 
     # Draw measure lines (most prominent grid line)
     if pixels_per_beat > 0 and time_signature_numerator > 0:
         pixels_per_measure = pixels_per_beat * time_signature_numerator
         if pixels_per_measure > 0:
-            painter.setPen(QPen(theme.GRID_MEASURE_LINE_COLOR, 1.0, Qt.PenStyle.SolidLine)) # Slightly more prominent
-            measure_number_y_pos = current_viewport_y_offset + theme.PADDING_M + theme.FONT_SIZE_S
-            for i in range(int(width / pixels_per_measure) + 1):
-                x = i * pixels_per_measure + keyboard_width
-                painter.drawLine(int(x), 0, int(x), height)
-                painter.setPen(QPen(theme.SECONDARY_TEXT_COLOR, 1.0))
-                painter.setFont(QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_XS))
-                painter.drawText(int(x + theme.PADDING_XS), measure_number_y_pos, str(i + 1))
+            measure_count = int(width / pixels_per_measure) + 1
+            # Includes measures just left of the view whose numbers still reach into it
+            measure_indices, measure_xs = visible_line_positions(pixels_per_measure, keyboard_width, left - MEASURE_NUMBER_REACH, right, measure_count)
+            painter.setPen(_PENS['measure_line'])
+            painter.drawLines([QLine(x, 0, x, height) for x in measure_xs])
+            # Measure numbers in a second pass so pen/font are set once, not per measure
+            measure_number_y_pos = viewport_y_offset + theme.PADDING_M + theme.FONT_SIZE_S
+            painter.setPen(_PENS['grid_text'])
+            painter.setFont(_FONTS['measure_number'])
+            for i, x in zip(measure_indices, measure_xs):
+                draw_grid_text(painter, x + theme.PADDING_XS, measure_number_y_pos, str(i + 1), 'measure_number')
             
     # Draw keyboard separator line
-    # Using BORDER_COLOR_NORMAL for a standard separator
-    piano_key_separator_color = getattr(theme, 'PIANO_KEY_SEPARATOR_COLOR', theme.BORDER_COLOR_NORMAL)
-    painter.setPen(QPen(piano_key_separator_color, 1.0)) 
+    painter.setPen(_PENS['key_separator'])
     painter.drawLine(keyboard_width, 0, keyboard_width, height)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, prev_antialiasing)
+
+# Rendered keyboards keyed by (vertical zoom factor, device pixel ratio)
+_keyboard_cache: dict[tuple[float, float], QPixmap] = {}
+_KEYBOARD_CACHE_LIMIT = 8
+
+def clear_paint_caches():
+    """Drop cached pens, fonts, brushes, grid rows, grid labels and keyboards, e.g. after theme colors change."""
+    _PENS.clear()
+    _FONTS.clear()
+    _BRUSHES.clear()
+    _NOTE_BRUSHES.clear()
+    _ytop_cache.clear()
+    _grid_row_cache.clear()
+    _key_layout_cache.clear()
+    _keyboard_cache.clear()
+    _grid_text_cache.clear()
+    _grid_font_ascents.clear()
+
+def refresh_theme_cache():
+    """Re-read theme colors and drop every cache derived from them. Call after switching themes."""
+    _resolve_theme_colors()
+    clear_paint_caches()
+
+def _render_keyboard_pixmap(vertical_zoom_factor, device_pixel_ratio):
+    total_height = (MAX_PITCH - MIN_PITCH + 1) * WHITE_KEY_HEIGHT * vertical_zoom_factor
+    pixmap = QPixmap(int(WHITE_KEY_WIDTH * device_pixel_ratio), int(total_height * device_pixel_ratio) + 1)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    pixmap.fill(Qt.GlobalColor.transparent) # Black-key rows leave the right edge uncovered
+
+    pixmap_painter = QPainter(pixmap)
+    pixmap_painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing)
+    _paint_piano_keys(pixmap_painter, vertical_zoom_factor)
+    pixmap_painter.end()
+    return pixmap
 
 def draw_piano_keys(painter, vertical_zoom_factor=1.0):
     """Draw the piano keyboard on the left side"""
-    effective_white_key_height = WHITE_KEY_HEIGHT * vertical_zoom_factor
-    effective_black_key_height = BLACK_KEY_HEIGHT * vertical_zoom_factor
-    drawn_black_keys = set()
+    # The keyboard only changes with zoom, so it is rendered once and blitted afterwards
+    device_pixel_ratio = painter.device().devicePixelRatioF()
+    key = (vertical_zoom_factor, device_pixel_ratio)
+    pixmap = _keyboard_cache.get(key)
+    if pixmap is None:
+        if len(_keyboard_cache) >= _KEYBOARD_CACHE_LIMIT:
+            _keyboard_cache.clear()
+        pixmap = _keyboard_cache[key] = _render_keyboard_pixmap(vertical_zoom_factor, device_pixel_ratio)
+    painter.drawPixmap(0, 0, pixmap)
 
-    # Define label colors (assuming these will be added to theme.py)
-    piano_key_label_color = getattr(theme, 'PIANO_KEY_LABEL_COLOR', theme.PRIMARY_TEXT_COLOR.darker(180)) # Darker text for light keys
-    piano_key_black_label_color = getattr(theme, 'PIANO_KEY_BLACK_LABEL_COLOR', theme.PRIMARY_TEXT_COLOR.lighter(180)) # Lighter text for dark keys
-    
-    # Draw white keys first
-    for pitch in range(MIN_PITCH, MAX_PITCH + 1):
-        pitch_class = pitch % 12
-        is_white = pitch_class in [0, 2, 4, 5, 7, 9, 11]
-        if is_white:
-            y_pos_key_top = (MAX_PITCH - pitch) * effective_white_key_height
-            key_rect = QRect(0, int(y_pos_key_top), WHITE_KEY_WIDTH, int(effective_white_key_height))
-            
-            base_color = theme.WHITE_KEY_COLOR # New theme constant
-            gradient = QLinearGradient(key_rect.topLeft(), key_rect.bottomLeft())
-            gradient.setColorAt(0.0, base_color.lighter(105))
-            gradient.setColorAt(1.0, base_color.darker(102))
-            painter.fillRect(key_rect, gradient)
-            painter.setPen(QPen(theme.KEY_BORDER_COLOR, 0.5)) # Use new theme constant, thin border
-            painter.drawRect(key_rect)
-    
-    # Draw black keys on top
-    for pitch in range(MIN_PITCH, MAX_PITCH + 1):
-        pitch_class = pitch % 12
-        is_black = pitch_class in [1, 3, 6, 8, 10]
-        if is_black:
-            if pitch in drawn_black_keys: continue
-            drawn_black_keys.add(pitch)
-            y_pos_key_top = (MAX_PITCH - pitch) * effective_white_key_height
-            key_rect = QRect(0, int(y_pos_key_top), BLACK_KEY_WIDTH, int(effective_black_key_height))
-            
-            base_color = theme.BLACK_KEY_COLOR # New theme constant
-            gradient = QLinearGradient(key_rect.topLeft(), key_rect.bottomLeft())
-            gradient.setColorAt(0.0, base_color.lighter(115)) # Black keys get less intense gradient
-            gradient.setColorAt(1.0, base_color)
-            painter.fillRect(key_rect, gradient)
-            painter.setPen(QPen(theme.KEY_BORDER_COLOR, 0.5)) # Use new theme constant
-            painter.drawRect(key_rect)
+# (white key rects, black key rects, white key labels, black key labels) per vertical zoom
+# factor; each label is a (rect, text) pair
+_key_layout_cache: dict[float, tuple[list, list, list, list]] = {}
 
-    # Draw labels on keys with bold, more visible font
-    label_font = QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_M, weight=theme.FONT_WEIGHT_BOLD) # Bigger, bolder font
-    painter.setFont(label_font)
-    metrics = QFontMetrics(label_font)
-
-    for pitch_label in range(MIN_LABEL_PITCH, MAX_LABEL_PITCH + 1):
-        if pitch_label < MIN_PITCH or pitch_label > MAX_PITCH: continue
-        pitch_class = pitch_label % 12
-        is_white_key_for_label = pitch_class in [0, 2, 4, 5, 7, 9, 11]
-        
+def _key_layout(vertical_zoom_factor):
+    layout = _key_layout_cache.get(vertical_zoom_factor)
+    if layout is None:
+        if len(_key_layout_cache) >= _ZOOM_CACHE_LIMIT:
+            _key_layout_cache.clear()
+        ytops = pitch_y_tops(vertical_zoom_factor)
+        white_key_height = int(WHITE_KEY_HEIGHT * vertical_zoom_factor)
+        black_key_height = int(BLACK_KEY_HEIGHT * vertical_zoom_factor)
+        white_rects = {p: QRect(0, ytops[p], WHITE_KEY_WIDTH, white_key_height) for p in _WHITE_PITCHES}
+        black_rects = {p: QRect(0, ytops[p], BLACK_KEY_WIDTH, black_key_height) for p in _BLACK_PITCHES}
         # Use the original note name directly - pretty_midi already gives correct octave numbers
         # C0 = MIDI 12, C1 = MIDI 24, C2 = MIDI 36, C3 = MIDI 48, C4 = MIDI 60 (Middle C), etc.
-        corrected_label_name = pretty_midi.note_number_to_name(pitch_label)
+        label_pitches = range(max(MIN_LABEL_PITCH, MIN_PITCH), min(MAX_LABEL_PITCH, MAX_PITCH) + 1)
+        layout = _key_layout_cache[vertical_zoom_factor] = (
+            list(white_rects.values()),
+            list(black_rects.values()),
+            [(white_rects[p], NOTE_NAMES[p]) for p in label_pitches if IS_WHITE_KEY[p]],
+            [(black_rects[p], NOTE_NAMES[p]) for p in label_pitches if not IS_WHITE_KEY[p]],
+        )
+    return layout
 
-        key_slot_y_top = (MAX_PITCH - pitch_label) * effective_white_key_height
-        
-        if is_white_key_for_label:
-            text_rect = QRect(0, int(key_slot_y_top), WHITE_KEY_WIDTH, int(effective_white_key_height))
-            painter.setPen(piano_key_label_color)
-            painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter, corrected_label_name)
-        else:
-            if pitch_label in drawn_black_keys: # Ensure label is only for drawn keys
-                black_key_rect = QRect(0, int(key_slot_y_top), BLACK_KEY_WIDTH, int(effective_black_key_height))
-                painter.setPen(piano_key_black_label_color)
-                painter.drawText(black_key_rect, Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter, corrected_label_name)
+def _paint_piano_keys(painter, vertical_zoom_factor):
+    if not _PENS:
+        _init_paint_cache()
+    white_rects, black_rects, white_labels, black_labels = _key_layout(vertical_zoom_factor)
+    # Key fills and borders are axis-aligned rects; antialiasing only matters for the labels
+    prev_antialiasing = painter.testRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+
+    # White keys first, black keys on top. Fill and border come from one drawRects call per
+    # colour; the object-bounding gradient brushes follow each key's rect
+    painter.setPen(_PENS['key_border'])
+    painter.setBrush(_BRUSHES['white_key'])
+    painter.drawRects(white_rects)
+    painter.setBrush(_BRUSHES['black_key'])
+    painter.drawRects(black_rects)
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, prev_antialiasing)
+
+    # Draw labels on keys with bold, more visible font
+    painter.setFont(_FONTS['key_label'])
+    label_alignment = Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter
+    painter.setPen(_THEME_COLORS['piano_key_label'])
+    for rect, label in white_labels:
+        painter.drawText(rect, label_alignment, label)
+    painter.setPen(_THEME_COLORS['piano_key_black_label'])
+    for rect, label in black_labels:
+        painter.drawText(rect, label_alignment, label)
+
+def build_note_index(notes):
+    """
+    Sort drawable notes by start time for viewport culling in draw_notes.
+    Returns (sorted_notes, start_times, longest_duration, note_arrays), where note_arrays
+    holds (pitches, starts, ends, velocities) NumPy arrays parallel to sorted_notes and
+    start_times is the same starts array.
+    """
+    sorted_notes = sorted(
+        (note for note in notes if hasattr(note, 'pitch') and hasattr(note, 'start') and hasattr(note, 'end')),
+        key=lambda n: n.start
+    )
+    starts = np.array([note.start for note in sorted_notes], dtype=np.float64)
+    ends = np.array([note.end for note in sorted_notes], dtype=np.float64)
+    longest_duration = float((ends - starts).max()) if len(sorted_notes) else 0.0
+    note_arrays = (
+        np.array([note.pitch for note in sorted_notes], dtype=np.int64),
+        starts,
+        ends,
+        np.array([getattr(note, 'velocity', 64) for note in sorted_notes], dtype=np.int64),
+    )
+    return sorted_notes, starts, longest_duration, note_arrays
+
+# Velocity (0-127) -> bucket lookup tables, keyed by the two split velocities
+_velocity_bucket_cache: dict[tuple[int, int], np.ndarray] = {}
+
+def velocity_buckets(velocity_splits):
+    """128-entry table of the velocity bucket (0 low, 1 medium, 2 high) for each MIDI velocity."""
+    lut = _velocity_bucket_cache.get(velocity_splits)
+    if lut is None:
+        low_split, high_split = velocity_splits
+        lut = _velocity_bucket_cache[velocity_splits] = np.repeat(
+            np.arange(3, dtype=np.int64), (low_split, high_split - low_split, 128 - high_split))
+    return lut
+
+def note_geometry(note_arrays, time_scale, vertical_zoom_factor, lowest_pitch=MIN_PITCH, highest_pitch=MAX_PITCH,
+                  x_offset=WHITE_KEY_WIDTH, velocity_splits=(50, 90)):
+    """
+    Lay out the notes in note_arrays (see build_note_index) in one vectorised pass, so the
+    paint loop only issues Qt calls. Notes outside lowest_pitch..highest_pitch are dropped.
+    Returns parallel lists (pitches, xs, ys, widths, heights, buckets, is_flat, has_label);
+    bucket is 0/1/2 for velocities below, between and from the two velocity_splits.
+    """
+    pitches, starts, ends, velocities = note_arrays
+    in_range = (pitches >= lowest_pitch) & (pitches <= highest_pitch)
+    pitches, starts, ends, velocities = pitches[in_range], starts[in_range], ends[in_range], velocities[in_range]
 
-def draw_notes(painter, notes, time_scale, vertical_zoom_factor=1.0):
-    """Draw the MIDI notes as colored rectangles"""
     effective_white_key_height = WHITE_KEY_HEIGHT * vertical_zoom_factor
     effective_black_key_height = BLACK_KEY_HEIGHT * vertical_zoom_factor
-    note_label_color = getattr(theme, 'NOTE_LABEL_COLOR', QColor(0,0,0,180)) # Fallback
+    padding = 4
+    is_white = _IS_WHITE_KEY_ARRAY[pitches]
+    xs = starts * time_scale + x_offset
+    widths = np.maximum((ends - starts) * time_scale, 4)
+    heights = np.where(is_white, effective_white_key_height - padding, effective_black_key_height - padding)
+    y_offsets = np.where(is_white, padding / 2, (effective_white_key_height - effective_black_key_height) / 2 + (padding / 2))
+    ys = np.asarray(pitch_y_tops(vertical_zoom_factor))[pitches] + y_offsets
+    buckets = velocity_buckets(velocity_splits)[np.clip(velocities, 0, 127)]
+    is_flat = (widths < FLAT_NOTE_MAX_WIDTH) | (heights < FLAT_NOTE_MAX_HEIGHT)
+    has_label = (widths >= NOTE_LABEL_MIN_WIDTH) & (heights >= NOTE_LABEL_MIN_HEIGHT)
+    return tuple(a.tolist() for a in (pitches, xs, ys, widths, heights, buckets, is_flat, has_label))
 
-    for note in notes:
-        if not hasattr(note, 'pitch') or not hasattr(note, 'start') or not hasattr(note, 'end'): continue
-        pitch = note.pitch
-        if pitch < MIN_PITCH or pitch > MAX_PITCH: continue
-        
-        y_pos = (MAX_PITCH - pitch) * effective_white_key_height 
-        x_pos = note.start * time_scale + WHITE_KEY_WIDTH
-        width = max((note.end - note.start) * time_scale, 4)
-        pitch_class = pitch % 12
-        is_white = pitch_class in [0, 2, 4, 5, 7, 9, 11]
-        padding = 4 
-
-        if is_white:
-            height = effective_white_key_height - padding 
-            y_offset = padding / 2
+def draw_notes(painter, notes, time_scale, vertical_zoom_factor=1.0, visible_rect=None, note_index=None):
+    """
+    Draw the MIDI notes as colored rectangles.
+    When visible_rect and a note_index from build_note_index() are given, only the notes
+    overlapping that rect are visited.
+    """
+    if not _PENS:
+        _init_paint_cache()
+    if note_index is None:
+        note_index = build_note_index(notes)
+    note_arrays = note_index[3]
+
+    lowest_pitch, highest_pitch = MIN_PITCH, MAX_PITCH
+    if visible_rect is not None and time_scale > 0:
+        lo, hi = notes_in_view_range(note_index, visible_rect, time_scale)
+        note_arrays = tuple(a[lo:hi] for a in note_arrays)
+        lowest_pitch, highest_pitch = visible_pitch_range(visible_rect, vertical_zoom_factor)
+
+    # Collect note rects per velocity bucket and labels first, then draw each group
+    # with its pen/brush set once instead of switching painter state for every note
+    # Only labelled notes take the rounded-rect path; the rest go out in one drawRects call
+    # per velocity bucket, gradient or flat depending on their size
+    rounded_rects = ([], [], [])
+    bucket_rects = ([], [], [])
+    flat_rects = ([], [], [])
+    labels = []
+
+    # Geometry, velocity buckets and size checks come precomputed; this loop only builds rects
+    for pitch, x_pos, y_pos, width, height, bucket, is_flat, has_label in zip(
+            *note_geometry(note_arrays, time_scale, vertical_zoom_factor, lowest_pitch, highest_pitch)):
+        note_rect = QRect(int(x_pos), int(y_pos), int(width), int(height))
+        # Note labels - only when the note is reasonably sized
+        if has_label:
+            rounded_rects[bucket].append(note_rect)
+            labels.append((QRectF(x_pos, y_pos, width, height), NOTE_NAMES[pitch]))
+        elif is_flat:
+            flat_rects[bucket].append(note_rect)
         else:
-            height = effective_black_key_height - padding 
-            y_offset = (effective_white_key_height - effective_black_key_height) / 2 + (padding / 2)
-            
-        velocity = getattr(note, 'velocity', 64)
-        # Use new theme note colors
-        if velocity < 50: color = theme.NOTE_LOW_COLOR
-        elif velocity < 90: color = theme.NOTE_MED_COLOR
-        else: color = theme.NOTE_HIGH_COLOR
-            
-        gradient = QLinearGradient(x_pos, y_pos + y_offset, x_pos, y_pos + y_offset + height)
-        gradient.setColorAt(0, color.lighter(130))
-        gradient.setColorAt(0.5, color)
-        gradient.setColorAt(1, color.darker(110))
-        
-        painter.setPen(QPen(theme.NOTE_BORDER_COLOR, 0.5)) # Use new theme constant, subtle
-        painter.setBrush(QBrush(gradient))
-        painter.drawRoundedRect(int(x_pos), int(y_pos + y_offset), int(width), int(height), 
-                                theme.BORDER_RADIUS_S, theme.BORDER_RADIUS_S) # Use theme radius
-        
-        # Note labels - make them bold and visible
-        corrected_label_name_note = pretty_midi.note_number_to_name(pitch)
+            bucket_rects[bucket].append(note_rect)
 
-        note_block_font = QFont(theme.FONT_FAMILY_PRIMARY, theme.FONT_SIZE_S, weight=theme.FONT_WEIGHT_BOLD) # Bigger, bolder font
-        painter.setFont(note_block_font)
-        
-        # Use high contrast color for note labels - white with some transparency for visibility
-        note_label_color = QColor(255, 255, 255, 220)  # Bright white with high opacity
-        painter.setPen(QPen(note_label_color))
-        
-        font_metrics = QFontMetrics(painter.font())
-        text_width_needed = font_metrics.horizontalAdvance(corrected_label_name_note)
-        text_height_needed = font_metrics.height()
-        note_content_rect = QRectF(x_pos, y_pos + y_offset, width, height)
-        
-        # More relaxed condition for showing text - show if note is reasonably sized
-        if width >= 25 and height >= 12:  # Simple size check instead of complex text fitting
-            painter.drawText(note_content_rect, Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter, corrected_label_name_note)
+    # The gradient brushes are relative to each shape's bounding box. drawRects fills every
+    # rect as its own shape, and labelled notes keep their own drawRoundedRect; one merged
+    # path per bucket would stretch a single gradient across all of its notes
+    painter.setPen(_PENS['note_border'])
+    # The batched notes are axis-aligned rects on whole pixels, so they skip the antialiasing
+    # rasterizer; only the rounded corners of labelled notes are drawn with antialiasing
+    prev_antialiasing = painter.testRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+    for brush, rects in zip(_NOTE_BRUSHES, bucket_rects):
+        if not rects: continue
+        painter.setBrush(brush)
+        painter.drawRects(rects)
+    # Small notes are plain rects, so each bucket goes out in a single drawRects call
+    for brush_name, rects in zip(('note_low_flat', 'note_med_flat', 'note_high_flat'), flat_rects):
+        if not rects: continue
+        painter.setBrush(_BRUSHES[brush_name])
+        painter.drawRects(rects)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, prev_antialiasing)
+    for brush, labelled_rects in zip(_NOTE_BRUSHES, rounded_rects):
+        if not labelled_rects: continue
+        painter.setBrush(brush)
+        for note_rect in labelled_rects:
+            painter.drawRoundedRect(note_rect, theme.BORDER_RADIUS_S, theme.BORDER_RADIUS_S) # Use theme radius
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+
+    painter.setFont(_FONTS['note_label'])
+    painter.setPen(_PENS['note_label'])
+    for note_content_rect, label in labels:
+        painter.drawText(note_content_rect, Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter, label)
+
+# Playhead marker triangles with their tip at (0, 0), keyed by (half width, height);
+# draw calls only translate them to the playhead x
+_playhead_triangle_cache: dict[tuple[int, int], QPolygon] = {}
+
+def playhead_triangle(half_width, height):
+    """Downward-pointing playhead marker with its tip at the origin, shared between paints."""
+    triangle = _playhead_triangle_cache.get((half_width, height))
+    if triangle is None:
+        triangle = _playhead_triangle_cache[(half_width, height)] = QPolygon(
+            [QPoint(0, 0), QPoint(-half_width, height), QPoint(half_width, height)]
+        )
+    return triangle
 
 def draw_playhead(painter, playhead_position, time_scale, height):
     """Draw the playhead indicator with shadow"""
     if playhead_position >= 0: # Allow drawing at position 0
-        playhead_x = playhead_position * time_scale + WHITE_KEY_WIDTH
+        if not _PENS:
+            _init_paint_cache()
+        playhead_x = int(playhead_position * time_scale + WHITE_KEY_WIDTH)
         shadow_offset_x = 2 # Increased offset for better visibility
         shadow_offset_y = 2 # Increased offset for better visibility
         triangle_size = theme.ICON_SIZE_S // 2 # Base size on theme icon size
-        triangle_height = int(triangle_size * 1.5)
+        triangle = playhead_triangle(triangle_size, int(triangle_size * 1.5))
 
         # --- Draw Shadow ---
         painter.save()
-        shadow_pen = QPen(theme.PLAYHEAD_SHADOW_COLOR, 2)
-        painter.setPen(shadow_pen)
-        painter.setBrush(QBrush(theme.PLAYHEAD_SHADOW_COLOR))
+        painter.setPen(_PENS['playhead_shadow'])
+        painter.setBrush(_BRUSHES['playhead_shadow'])
 
         # Shadow for the line
-        painter.drawLine(int(playhead_x + shadow_offset_x), shadow_offset_y, int(playhead_x + shadow_offset_x), height + shadow_offset_y)
+        painter.drawLine(playhead_x + shadow_offset_x, shadow_offset_y, playhead_x + shadow_offset_x, height + shadow_offset_y)
         
         # Shadow for the triangle
-        shadow_points = [
-            QPoint(int(playhead_x + shadow_offset_x), shadow_offset_y),
-            QPoint(int(playhead_x - triangle_size + shadow_offset_x), triangle_height + shadow_offset_y),
-            QPoint(int(playhead_x + triangle_size + shadow_offset_x), triangle_height + shadow_offset_y)
-        ]
-        painter.drawPolygon(shadow_points)
+        painter.drawPolygon(triangle.translated(playhead_x + shadow_offset_x, shadow_offset_y))
         painter.restore()
 
         # --- Draw Main Playhead ---
         # Main line
-        playhead_pen = QPen(theme.PLAYHEAD_COLOR, 2) # Use theme color, 2px width
-        painter.setPen(playhead_pen)
-        painter.drawLine(int(playhead_x), 0, int(playhead_x), height)
+        painter.setPen(_PENS['playhead']) # Use theme color, 2px width
+        painter.drawLine(playhead_x, 0, playhead_x, height)
         
         # Triangle marker
-        # playhead_triangle_color is already defined in theme.py and should be used directly
-        painter.setBrush(QBrush(theme.PLAYHEAD_TRIANGLE_COLOR)) # Solid color
+        painter.setBrush(_BRUSHES['playhead_triangle']) # Solid color
         painter.setPen(Qt.PenStyle.NoPen) # No border for triangle for cleaner look
-        
-        points = [
-            QPoint(int(playhead_x), 0),
-            QPoint(int(playhead_x - triangle_size), triangle_height),
-            QPoint(int(playhead_x + triangle_size), triangle_height)
-        ]
-        painter.drawPolygon(points)
\ No newline at end of file
+        painter.drawPolygon(triangle.translated(playhead_x, 0))
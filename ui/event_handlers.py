@@ -1,20 +1,17 @@
-from PySide6.QtCore import Qt, QEvent, QObject
-from PySide6.QtGui import QKeyEvent
-from PySide6.QtWidgets import QApplication, QLineEdit, QTextEdit, QSpinBox, QDoubleSpinBox, QComboBox
+import logging
+
+from PySide6.QtCore import Qt, QObject
+from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtWidgets import QApplication, QLineEdit, QTextEdit, QSpinBox, QDoubleSpinBox
+
+logger = logging.getLogger(__name__)
 
 class MainWindowEventHandlersMixin:
     """
-    Mixin class to handle specific events for the main window,
-    such as keyboard shortcuts and close events.
-    This event filter is installed on the MainWindow itself.
+    Mixin class to handle specific events for the main window, such as close events.
+    Spacebar playback is handled application-wide by GlobalPlaybackHotkey.
     """
     
-    def eventFilter(self, watched, event):
-        """Event filter for MainWindow - spacebar handling is now done in the main window class."""
-        # Spacebar handling moved to PianoRollMainWindow.eventFilter() to avoid conflicts
-        # This mixin eventFilter is kept for other potential shortcuts in the future
-        return super().eventFilter(watched, event)
-    
     def closeEvent(self, event):
         """Clean up resources when window is closed."""
         if hasattr(self, 'midi_player') and self.midi_player:
@@ -30,41 +27,46 @@ class MainWindowEventHandlersMixin:
             
         super().closeEvent(event)
 
-class GlobalPlaybackHotkeyFilter(QObject):
+# Widgets where Space is typed text rather than the playback hotkey
+_TEXT_INPUT_TYPES = (QLineEdit, QTextEdit, QSpinBox, QDoubleSpinBox)
+
+class GlobalPlaybackHotkey(QObject):
     """
-    Global event filter to handle Spacebar for toggling playback.
-    Installed on QApplication.instance().
+    Application-wide Spacebar shortcut for toggling playback.
+    A QShortcut only reaches Python when Space is pressed, whereas an event filter on
+    QApplication.instance() is called for every event in the process. Text inputs still
+    receive Space: they accept Qt's ShortcutOverride for typed characters, so the
+    shortcut does not fire while one of them has focus.
     """
-    def __init__(self, main_window_toggle_method, parent=None):
+    def __init__(self, main_window_toggle_method, parent):
         super().__init__(parent)
         self.main_window_toggle_method = main_window_toggle_method
+        self.shortcut = QShortcut(QKeySequence(Qt.Key_Space), parent)
+        self.shortcut.setContext(Qt.ApplicationShortcut)
+        self.shortcut.activated.connect(self._on_activated)
 
-    def eventFilter(self, watched, event):
-        if event.type() == QEvent.KeyPress:
-            if isinstance(event, QKeyEvent) and event.key() == Qt.Key_Space:
-                focused_widget = QApplication.focusWidget()
-                
-                print(f"🎹 GlobalFilter: Spacebar pressed! Focused widget: {focused_widget.__class__.__name__ if focused_widget else 'None'}")
-                
-                # Don't handle spacebar if user is typing in text fields
-                if isinstance(focused_widget, (QLineEdit, QTextEdit, QSpinBox, QDoubleSpinBox)):
-                    print("❌ GlobalFilter: Spacebar ignored - user is typing in text input field")
-                    return False
+    def _on_activated(self):
+        focused_widget = QApplication.focusWidget()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("GlobalHotkey: Spacebar pressed! Focused widget: %s",
+                         focused_widget.__class__.__name__ if focused_widget else 'None')
 
-                if isinstance(focused_widget, QComboBox) and focused_widget.view().isVisible():
-                    print("❌ GlobalFilter: Spacebar ignored - ComboBox dropdown is open")
-                    return False
+        # Don't handle spacebar if user is typing in text fields
+        if isinstance(focused_widget, _TEXT_INPUT_TYPES):
+            logger.debug("GlobalHotkey: Spacebar ignored - user is typing in text input field")
+            return
 
-                # Handle spacebar for playback
-                if callable(self.main_window_toggle_method):
-                    print("✅ GlobalFilter: Spacebar handled - calling toggle_playback!")
-                    try:
-                        self.main_window_toggle_method()
-                        return True  # Event consumed
-                    except Exception as e:
-                        print(f"❌ GlobalFilter: Error calling toggle_playback: {e}")
-                        return False
-                else:
-                    print("❌ GlobalFilter: toggle_playback method not callable!")
-        
-        return False  # Don't consume other events
+        # e.g. an open ComboBox dropdown
+        if QApplication.activePopupWidget() is not None:
+            logger.debug("GlobalHotkey: Spacebar ignored - a popup is open")
+            return
+
+        # Handle spacebar for playback
+        if callable(self.main_window_toggle_method):
+            logger.debug("GlobalHotkey: Spacebar handled - calling toggle_playback!")
+            try:
+                self.main_window_toggle_method()
+            except Exception as e:
+                logger.error("GlobalHotkey: Error calling toggle_playback: %s", e)
+        else:
+            logger.debug("GlobalHotkey: toggle_playback method not callable!")
@@ -1,49 +1,48 @@
 import sys
+import logging
+from typing import TYPE_CHECKING
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QScrollArea, QSizePolicy, QSlider, QStyle, QToolButton,
-    QFrame, QSpacerItem, QDockWidget, QListWidget, QListWidgetItem,
-    QFormLayout, QSpinBox, QDoubleSpinBox, QComboBox, QCheckBox,
-    QDialog, QDialogButtonBox, QFileDialog, QApplication, QMessageBox,
-    QLineEdit, QTextEdit
+    QMainWindow, QWidget, QVBoxLayout, QSizePolicy, QDockWidget, QApplication, QMessageBox
 )
-from PySide6.QtCore import Qt, QTimer, Signal, Slot, QSize, QEvent
-from PySide6.QtGui import QKeyEvent, QColor, QPalette, QFont, QLinearGradient, QBrush
-import pretty_midi
-import time
-import os
+from PySide6.QtCore import Qt, QTimer, Slot, QEvent
+from operator import attrgetter
+
+if TYPE_CHECKING:
+    import pretty_midi
+
+logger = logging.getLogger(__name__)
 
 # Import fixes - Try absolute imports first, then relative imports
 try:
-    from note_display import PianoRollDisplay, PianoRollComposite
+    from note_display import PianoRollComposite
     from midi_player import MidiPlayer
-    from plugin_manager import PluginManager
-    from export_utils import export_to_midi
 except ImportError:
     try:
-        from ..note_display import PianoRollDisplay, PianoRollComposite
+        from ..note_display import PianoRollComposite
         from ..midi_player import MidiPlayer
-        from ..plugin_manager import PluginManager
-        from ..export_utils import export_to_midi
     except ImportError as e:
         print(f"Failed to import modules: {e}")
         sys.exit(1)
 
-from .custom_widgets import ModernSlider, ModernButton
-from .plugin_dialogs import PluginParameterDialog
-from .plugin_panel import PluginManagerPanel
+from .widget_styles import MAIN_WINDOW_QSS
 from .ai_studio_panel import AIStudioPanel
 from .transport_controls import TransportControls
-from .event_handlers import MainWindowEventHandlersMixin, GlobalPlaybackHotkeyFilter
+from .event_handlers import MainWindowEventHandlersMixin, GlobalPlaybackHotkey
 
-try:
-    from config import theme
-except ImportError:
-    try:
-        from ..config import theme
-    except ImportError as e:
-        print(f"Failed to import theme config: {e}")
-        sys.exit(1)
+
+# Playback timer interval while the window is hidden or minimized
+HIDDEN_PLAYBACK_INTERVAL_MS = 200
+
+# Delay after the window is first shown before the Plugin Manager panel is built
+PLUGIN_PANEL_BUILD_DELAY_MS = 100
+
+_note_end = attrgetter('end')
+
+def _latest_note_end(notes):
+    """End time of the last-ending note, or 0.0 when there are none."""
+    # Every note source (file loads, plugins, AI generation, display edits) hands over
+    # pretty_midi.Note objects, so .end is read directly rather than probed per note
+    return max(map(_note_end, notes), default=0.0)
 
 
 class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
@@ -74,6 +73,21 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
         self.midi_player = MidiPlayer()
         self.bpm = 120
         self.total_duration = 10.0
+        self._max_end_time = _latest_note_end(self.midi_notes) # Kept current on every note change
+        # Bumped on every change to self.midi_notes; _share_notes() hands each revision out once
+        self._notes_revision = 0
+        self._shared_notes_revision = 0
+        # Notes streamed in one at a time are shared once per event-loop pass
+        self._share_notes_timer = QTimer(self)
+        self._share_notes_timer.setSingleShot(True)
+        self._share_notes_timer.setInterval(0)
+        self._share_notes_timer.timeout.connect(self._share_notes)
+        # Components are created below; None until then so callers can test with `is not None`
+        self.piano_roll = None
+        self.transport_controls = None
+        self.ai_studio_panel = None
+        # Built on first use (see _ensure_plugin_panel) so startup doesn't wait on the plugin scan
+        self.plugin_manager_panel = None
         
         self._apply_stylesheet()
         
@@ -90,165 +104,49 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
         self.main_layout.addWidget(self.transport_controls)
         self._connect_transport_signals()
         
-        self.create_plugin_manager()
         self.create_ai_studio_panel()
         
         # 🔧 FIXED: Install global spacebar handler that works everywhere
-        self.global_hotkey_filter = GlobalPlaybackHotkeyFilter(self.toggle_playback)
-        QApplication.instance().installEventFilter(self.global_hotkey_filter)
-        print("Global spacebar event filter installed for playback control.")
+        self.global_hotkey = GlobalPlaybackHotkey(self.toggle_playback, self)
+        print("Global spacebar shortcut installed for playback control.")
         
         # Enable focus on main window to receive key events for debug shortcuts
         self.setFocusPolicy(Qt.StrongFocus)
             
         self.playback_timer = QTimer(self)
+        # Ticks drive the playhead, so keep them evenly spaced rather than coalesced
+        self.playback_timer.setTimerType(Qt.PreciseTimer)
+        # Last values pushed to the transport by update_playback_position
+        self._last_slider_ms = None
+        self._last_label_position = None
+        # False while the window is hidden or minimized; playback ticks then leave the widgets alone
+        self._ui_active = False
         self.update_timer_interval()
         self.playback_timer.timeout.connect(self.update_playback_position)
 
+        # Slider scrubbing moves the playhead at once but only seeks the player once it settles
+        self._pending_seek = None
+        self._seek_debounce = QTimer(self)
+        self._seek_debounce.setSingleShot(True)
+        self._seek_debounce.setInterval(40)
+        self._seek_debounce.timeout.connect(self._apply_pending_seek)
+
         # Initialize transport controls after all components are ready
         self.transport_controls.set_bpm_value(self.bpm)
         self.update_slider_range()
         
         # Debug: Print dock options to ensure they're set correctly
         print(f"Dock options enabled: {self.dockOptions()}")
-        print(f"Plugin Manager allowed areas: {self.plugin_manager_panel.allowedAreas()}")
         print(f"AI Studio allowed areas: {self.ai_studio_panel.allowedAreas()}")
+
+        # The Plugin Manager is the panel shown at startup; showEvent builds it after the first paint
+        self._initial_plugin_panel_pending = True
         
         # Note: Dock detection zones are now provided by 5px margins around central widget
 
     def _apply_stylesheet(self):
-        # Global stylesheet using constants from theme.py
-        qss = f"""
-            QMainWindow, QWidget {{
-                background-color: {theme.APP_BG_COLOR.name()};
-                color: {theme.PRIMARY_TEXT_COLOR.name()};
-                font-family: "{theme.FONT_FAMILY_PRIMARY}";
-                font-size: {theme.FONT_SIZE_M}pt;
-            }}
-
-            QLabel {{
-                color: {theme.PRIMARY_TEXT_COLOR.name()};
-                font-family: "{theme.FONT_FAMILY_PRIMARY}";
-                font-size: {theme.FONT_SIZE_M}pt;
-            }}
-
-            QDockWidget::title {{
-                background-color: {theme.PANEL_BG_COLOR.darker(110).name()};
-                color: {theme.PRIMARY_TEXT_COLOR.name()};
-                font-family: "{theme.FONT_FAMILY_PRIMARY}";
-                font-size: {theme.FONT_SIZE_L}pt;
-                font-weight: {theme.FONT_WEIGHT_BOLD};
-                padding: {theme.PADDING_S}px {theme.PADDING_M}px;
-                border-bottom: 1px solid {theme.BORDER_COLOR_NORMAL.name()};
-                text-align: left;
-            }}
-
-            QDockWidget {{
-                border: 1px solid {theme.BORDER_COLOR_NORMAL.name()};
-                titlebar-close-icon: url();
-                titlebar-normal-icon: url();
-            }}
-            
-            /* Dock widget separator styling */
-            QMainWindow::separator {{
-                background-color: {theme.BORDER_COLOR_NORMAL.name()};
-                width: 2px;
-                height: 2px;
-            }}
-            
-            QMainWindow::separator:hover {{
-                background-color: {theme.ACCENT_PRIMARY_COLOR.name()};
-            }}
-            
-            /* Ensure dock indicators are visible */
-            QMainWindow QRubberBand {{
-                background-color: {theme.ACCENT_PRIMARY_COLOR.name()};
-                border: 2px solid {theme.ACCENT_HOVER_COLOR.name()};
-                opacity: 0.7;
-            }}
-            
-            QScrollBar:horizontal {{
-                background-color: {theme.PANEL_BG_COLOR.lighter(110).name()};
-                height: 10px;
-                margin: 0px 0px 0px 0px;
-                border-radius: {theme.BORDER_RADIUS_S}px;
-            }}
-            QScrollBar::handle:horizontal {{
-                background-color: {theme.BORDER_COLOR_NORMAL.name()};
-                min-width: 20px;
-                border-radius: {theme.BORDER_RADIUS_S}px;
-                margin: 2px 0px 2px 0px;
-            }}
-            QScrollBar::handle:horizontal:hover {{
-                background-color: {theme.BORDER_COLOR_HOVER.name()};
-            }}
-            QScrollBar::handle:horizontal:pressed {{
-                background-color: {theme.ACCENT_PRIMARY_COLOR.name()};
-            }}
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {{
-                border: none;
-                background: none;
-                width: 0px;
-            }}
-            QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {{
-                background: none;
-            }}
-
-            QScrollBar:vertical {{
-                background-color: {theme.PANEL_BG_COLOR.lighter(110).name()};
-                width: 10px;
-                margin: 0px 0px 0px 0px;
-                border-radius: {theme.BORDER_RADIUS_S}px;
-            }}
-            QScrollBar::handle:vertical {{
-                background-color: {theme.BORDER_COLOR_NORMAL.name()};
-                min-height: 20px;
-                border-radius: {theme.BORDER_RADIUS_S}px;
-                margin: 0px 2px 0px 2px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-                background-color: {theme.BORDER_COLOR_HOVER.name()};
-            }}
-            QScrollBar::handle:vertical:pressed {{
-                background-color: {theme.ACCENT_PRIMARY_COLOR.name()};
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                border: none;
-                background: none;
-                height: 0px;
-            }}
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{
-                background: none;
-            }}
-
-            QScrollArea {{
-                background-color: {theme.PIANO_ROLL_BG_COLOR.name()}; 
-                border: 1px solid {theme.BORDER_COLOR_NORMAL.name()};
-            }}
-            
-            QPushButton {{
-                background-color: {theme.STANDARD_BUTTON_BG_COLOR.name()};
-                color: {theme.STANDARD_BUTTON_TEXT_COLOR.name()};
-                border: 1px solid {theme.BORDER_COLOR_NORMAL.name()};
-                padding: {theme.PADDING_S}px {theme.PADDING_M}px;
-                border-radius: {theme.BORDER_RADIUS_M}px;
-                font-family: "{theme.FONT_FAMILY_PRIMARY}";
-                font-size: {theme.FONT_SIZE_M}pt;
-            }}
-            QPushButton:hover {{
-                background-color: {theme.STANDARD_BUTTON_HOVER_BG_COLOR.name()};
-                border: 1px solid {theme.BORDER_COLOR_HOVER.name()};
-            }}
-            QPushButton:pressed {{
-                background-color: {theme.STANDARD_BUTTON_PRESSED_BG_COLOR.name()};
-            }}
-            QPushButton:disabled {{
-                background-color: {theme.DISABLED_BG_COLOR.name()};
-                color: {theme.DISABLED_TEXT_COLOR.name()};
-                border-color: {theme.DISABLED_BG_COLOR.darker(110).name()};
-            }}
-        """
-        self.setStyleSheet(qss)
+        # Global stylesheet using constants from config.theme, built once in ui.widget_styles
+        self.setStyleSheet(MAIN_WINDOW_QSS)
 
     def _setup_central_widget(self):
         self.central_widget = QWidget()
@@ -267,6 +165,8 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
         self.main_layout.setSpacing(0)
     
     def create_plugin_manager(self):
+        # Imported here: the panel module pulls in the plugin manager, which startup doesn't need
+        from .plugin_panel import PluginManagerPanel
         self.plugin_manager_panel = PluginManagerPanel(self)
         # Ensure proper dock widget features for better docking behavior
         self.plugin_manager_panel.setFeatures(
@@ -278,6 +178,17 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
         self.plugin_manager_panel.notesGenerated.connect(self.set_midi_notes)
         self.plugin_manager_panel.set_current_notes(self.midi_notes)
 
+    def _ensure_plugin_panel(self):
+        """Return the Plugin Manager panel, creating it on first use."""
+        if self.plugin_manager_panel is None:
+            self.create_plugin_manager()
+        return self.plugin_manager_panel
+
+    def _show_initial_plugin_panel(self):
+        # Skip if the user already switched to AI Studio before the timer fired
+        if self.ai_studio_panel.isHidden():
+            self._ensure_plugin_panel()
+
     def create_ai_studio_panel(self):
         self.ai_studio_panel = AIStudioPanel(self)
         # Ensure proper dock widget features for better docking behavior
@@ -295,15 +206,16 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
         self.ai_studio_panel.hide()
 
     def _connect_transport_signals(self):
-        self.transport_controls.playClicked.connect(self.start_playback)
-        self.transport_controls.pauseClicked.connect(self.pause_playback)
-        self.transport_controls.stopClicked.connect(self.stop_playback)
-        self.transport_controls.seekPositionChanged.connect(self.slider_position_changed_slot)
-        self.transport_controls.bpmChangedSignal.connect(self.bpm_changed_slot)
-        self.transport_controls.instrumentChangedSignal.connect(self.instrument_changed_slot)
-        self.transport_controls.volumeChangedSignal.connect(self.volume_changed_slot)
-        self.transport_controls.aiModeToggled.connect(self.toggle_ai_mode)
-        self.transport_controls.clearNotesClicked.connect(self.clear_notes)
+        # Emitted from the transport's widget handlers on this thread, so connect directly
+        self.transport_controls.playClicked.connect(self.start_playback, Qt.DirectConnection)
+        self.transport_controls.pauseClicked.connect(self.pause_playback, Qt.DirectConnection)
+        self.transport_controls.stopClicked.connect(self.stop_playback, Qt.DirectConnection)
+        self.transport_controls.seekPositionChanged.connect(self.slider_position_changed_slot, Qt.DirectConnection)
+        self.transport_controls.bpmChangedSignal.connect(self.bpm_changed_slot, Qt.DirectConnection)
+        self.transport_controls.instrumentChangedSignal.connect(self.instrument_changed_slot, Qt.DirectConnection)
+        self.transport_controls.volumeChangedSignal.connect(self.volume_changed_slot, Qt.DirectConnection)
+        self.transport_controls.aiModeToggled.connect(self.toggle_ai_mode, Qt.DirectConnection)
+        self.transport_controls.clearNotesClicked.connect(self.clear_notes, Qt.DirectConnection)
 
     def create_piano_roll_display(self):
         # Use the new composite widget with fixed piano keys
@@ -311,69 +223,79 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
         self.piano_roll.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.main_layout.addWidget(self.piano_roll, 1)
         
-        # Connect signals from PianoRollComposite
-        self.piano_roll.midiFileProcessed.connect(self.handle_midi_file_processed)
-        self.piano_roll.notesChanged.connect(self.handle_notes_changed_from_display)
+        # Connect signals from PianoRollComposite (GUI thread, so directly)
+        self.piano_roll.midiFileProcessed.connect(self.handle_midi_file_processed, Qt.DirectConnection)
+        self.piano_roll.notesChanged.connect(self.handle_notes_changed_from_display, Qt.DirectConnection)
 
     @Slot(list)
     def handle_midi_file_processed(self, loaded_notes: list):
         """Handles notes loaded from a dropped MIDI file."""
-        print(f"MainWindow: MIDI file processed, {len(loaded_notes)} notes received.")
+        logger.debug("MainWindow: MIDI file processed, %d notes received.", len(loaded_notes))
         self.set_midi_notes(loaded_notes)
         self.stop_playback()
 
     @Slot(list)
     def handle_notes_changed_from_display(self, current_notes_in_display: list):
         """Handles notes changed by direct interaction in PianoRollDisplay."""
-        print(f"MainWindow: Notes changed in display, {len(current_notes_in_display)} notes.")
+        logger.debug("MainWindow: Notes changed in display, %d notes.", len(current_notes_in_display))
         
         self.midi_notes = current_notes_in_display
-        
+        self._notes_revision += 1
+        self._share_notes()
+
+    def _share_notes(self):
+        """
+        Hand self.midi_notes to the player, the panels and the transport, and recompute the
+        duration. Changes made here also reach handle_notes_changed_from_display through the
+        display, so each revision is only handed out once.
+        """
+        if self._shared_notes_revision == self._notes_revision:
+            return
+        self._shared_notes_revision = self._notes_revision
+
         self.midi_player.set_notes(self.midi_notes)
-        if hasattr(self, 'plugin_manager_panel'):
+        if self.plugin_manager_panel is not None:
             self.plugin_manager_panel.set_current_notes(self.midi_notes)
-        if hasattr(self, 'ai_studio_panel'):
+        if self.ai_studio_panel is not None:
             self.ai_studio_panel.set_current_notes(self.midi_notes)
-        if hasattr(self, 'transport_controls'):
+        if self.transport_controls is not None:
             self.transport_controls.set_current_notes(self.midi_notes)
         
-        # Recalculate duration and update UI elements
-        max_end_time = 0
-        if self.midi_notes:
-            for note in self.midi_notes:
-                if hasattr(note, 'end') and note.end > max_end_time:
-                    max_end_time = note.end
-        self.total_duration = max_end_time + 1.0
+        # Recalculate duration and update UI elements. Edits in the display can move or
+        # delete the latest note, so the end times are read again for every revision. The
+        # display already holds its notes as NumPy arrays for painting, so use those
+        if self.piano_roll is not None and self.piano_roll.notes is self.midi_notes:
+            self._max_end_time = self.piano_roll.latest_note_end()
+        else:
+            self._max_end_time = _latest_note_end(self.midi_notes)
+        self.total_duration = self._max_end_time + 1.0
         self.update_slider_range()
 
     def set_midi_notes(self, notes: list):
         """Primary method to update notes across the application."""
-        print(f"PianoRollMainWindow: Setting {len(notes)} notes globally.")
         self.midi_notes = notes if notes is not None else []
+        logger.debug("PianoRollMainWindow: Setting %d notes globally.", len(self.midi_notes))
+        self._notes_revision += 1
         
-        # Update PianoRollDisplay
-        if hasattr(self, 'piano_roll') and self.piano_roll.notes != self.midi_notes:
-            self.piano_roll.set_notes(self.midi_notes) 
-        
-        self.midi_player.set_notes(notes)
-        
-        max_end_time = 0
-        for note in notes:
-            if hasattr(note, 'end') and note.end > max_end_time:
-                max_end_time = note.end
-        
-        self.total_duration = max_end_time + 1.0
-        self.update_slider_range()
-        
-        if hasattr(self, 'plugin_manager_panel'):
-            self.plugin_manager_panel.set_current_notes(notes)
-        if hasattr(self, 'ai_studio_panel'):
-            self.ai_studio_panel.set_current_notes(notes)
-        if hasattr(self, 'transport_controls'):
-            self.transport_controls.set_current_notes(notes)
+        # An identity check: comparing the lists would walk every note. A different list with
+        # equal notes is still handed over, so the display and the window share one list
+        if self.piano_roll is not None and self.piano_roll.notes is not self.midi_notes:
+            self._set_display_notes()
+        self._share_notes()
         
         self.transport_controls.set_bpm_value(self.bpm)
 
+    def _set_display_notes(self):
+        """
+        Hand self.midi_notes to the piano roll without it echoing them back through
+        notesChanged; the caller shares them with everything else via _share_notes().
+        """
+        was_blocked = self.piano_roll.blockSignals(True)
+        try:
+            self.piano_roll.set_notes(self.midi_notes)
+        finally:
+            self.piano_roll.blockSignals(was_blocked)
+
     def clear_notes(self):
         """Clear all notes with user confirmation"""
         # Check if there are any notes to clear
@@ -398,60 +320,48 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
             
             # Clear notes
             self.midi_notes = []
-            if hasattr(self, 'piano_roll'):
-                self.piano_roll.set_notes([])
-            if hasattr(self, 'midi_player'):
-                self.midi_player.set_notes([])
+            self._notes_revision += 1
+            if self.piano_roll is not None:
+                self._set_display_notes()
+            self._share_notes()
             
             self.total_duration = 10.0
             self.update_slider_range()
-            if hasattr(self, 'piano_roll'):
+            if self.transport_controls is not None:
+                self.transport_controls.reset_to_zero(False)
+            if self.piano_roll is not None:
                 self.piano_roll.set_playhead_position(0)
-            
-            if hasattr(self, 'transport_controls'):
-                self.transport_controls.update_position_label(0)
-                self.transport_controls.update_time_slider_value(0)
-
-            if hasattr(self, 'plugin_manager_panel'):
-                self.plugin_manager_panel.set_current_notes([])
-            if hasattr(self, 'ai_studio_panel'):
-                self.ai_studio_panel.set_current_notes([])
-            if hasattr(self, 'transport_controls'):
-                self.transport_controls.set_current_notes([])
                 
             print(f"✅ Successfully cleared all notes from piano roll.")
         else:
             print("PianoRollMainWindow: Clear notes cancelled by user.")
 
-    def receive_generated_note(self, note: pretty_midi.Note):
-        if not hasattr(note, 'start') or not hasattr(note, 'end') or not hasattr(note, 'pitch'):
-            print(f"PianoRollMainWindow: Received invalid note object: {note}")
-            return
-
-        self.midi_notes.append(note)
-        if hasattr(self, 'piano_roll'):
-            self.piano_roll.add_note(note)
-
-        if note.end > self.total_duration:
-            self.total_duration = note.end + 1.0
+    def receive_generated_note(self, note: 'pretty_midi.Note'):
+        """Add one streamed note. Generators hand over pretty_midi.Note objects, so it isn't probed."""
+        # The display usually holds self.midi_notes itself, and add_note appends to it
+        if self.piano_roll is None or self.piano_roll.notes is not self.midi_notes:
+            self.midi_notes.append(note)
+        if self.piano_roll is not None:
+            self.piano_roll.add_note(note, emit_change=False)
+        self._notes_revision += 1
+
+        # One added note can only raise the latest end, so no rescan is needed
+        if note.end > self._max_end_time:
+            self._max_end_time = note.end
+            self.total_duration = self._max_end_time + 1.0
             self.update_slider_range()
         
-        if hasattr(self, 'plugin_manager_panel'):
-            self.plugin_manager_panel.set_current_notes(self.midi_notes)
-        if hasattr(self, 'ai_studio_panel'):
-            self.ai_studio_panel.set_current_notes(self.midi_notes)
-        if hasattr(self, 'transport_controls'):
-            self.transport_controls.set_current_notes(self.midi_notes)
+        # A plugin may send many notes in a row; hand them to the player and panels once
+        self._share_notes_timer.start()
     
     def toggle_playback(self):
-        print(f"🎮 toggle_playback() called! Current state: {'Playing' if self.midi_player.is_playing else 'Stopped/Paused'}")
-        print(f"🎵 Current notes count: {len(self.midi_notes)}")
+        logger.debug("toggle_playback() called with %d notes", len(self.midi_notes))
         
         if self.midi_player.is_playing:
-            print("MainWindow: Toggle playback - was playing, now stopping and resetting.")
+            logger.debug("MainWindow: Toggle playback - was playing, now stopping and resetting.")
             self.stop_playback() 
         else:
-            print("MainWindow: Toggle playback - was stopped/paused, now starting from beginning.")
+            logger.debug("MainWindow: Toggle playback - was stopped/paused, now starting from beginning.")
             if self.midi_player.get_current_position() != 0.0:
                  self.midi_player.seek(0.0)
                  self.piano_roll.set_playhead_position(0.0)
@@ -461,11 +371,15 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
     
     def start_playback(self):
         if not self.midi_player.notes and self.midi_notes:
-            print("FIXING: Re-setting notes before playback")
+            logger.debug("Re-setting notes in the player before playback")
             self.midi_player.set_notes(self.midi_notes)
-        time.sleep(0.1)
+        if self._seek_debounce.isActive():
+            self._seek_debounce.stop()
+            self._apply_pending_seek()
         self.midi_player.play()
         self.transport_controls.set_playing_state(True)
+        # Other paths move the slider and label too, so resend both on the first tick
+        self._last_slider_ms = self._last_label_position = None
         self.update_timer_interval()
         self.playback_timer.start()
     
@@ -475,27 +389,45 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
         self.playback_timer.stop()
     
     def stop_playback(self):
+        self._seek_debounce.stop() # Stopping rewinds to 0, so a pending seek is moot
+        self._pending_seek = None
         self.midi_player.stop()
-        self.transport_controls.set_playing_state(False)
         self.playback_timer.stop()
-        self.transport_controls.update_time_slider_value(0)
-        self.transport_controls.update_position_label(0)
+        self.transport_controls.reset_to_zero(False)
         self.piano_roll.set_playhead_position(0)
     
     def update_playback_position(self):
+        if self._seek_debounce.isActive():
+            return # The player hasn't caught up with the slider yet
         position = self.midi_player.get_current_position()
+        if position >= self.total_duration and self.midi_player.is_playing:
+            self.stop_playback()
+            return
+        if not self._ui_active:
+            return # Nothing on screen to update; audio carries on in the player
+        # Only push values that changed at the precision each widget shows
         slider_value_ms = int(position * 1000)
-        self.transport_controls.update_time_slider_value(slider_value_ms)
-        self.transport_controls.update_position_label(position)
+        if slider_value_ms != self._last_slider_ms:
+            self._last_slider_ms = slider_value_ms
+            self.transport_controls.update_time_slider_value(slider_value_ms)
+        label_position = round(position, 1) # The label shows tenths of a second
+        if label_position != self._last_label_position:
+            self._last_label_position = label_position
+            self.transport_controls.update_position_label(position)
+        # The display skips repaints itself until the playhead reaches a new pixel column
         self.piano_roll.set_playhead_position(position)
-        if hasattr(self, 'total_duration') and position >= self.total_duration and self.midi_player.is_playing:
-            self.stop_playback()
 
     @Slot(float)
     def slider_position_changed_slot(self, position_seconds):
-        self.midi_player.seek(position_seconds)
         self.transport_controls.update_position_label(position_seconds)
         self.piano_roll.set_playhead_position(position_seconds)
+        self._pending_seek = position_seconds
+        self._seek_debounce.start() # Restarts while the slider keeps moving
+
+    def _apply_pending_seek(self):
+        if self._pending_seek is not None:
+            self.midi_player.seek(self._pending_seek)
+            self._pending_seek = None
 
     @Slot(int)
     def bpm_changed_slot(self, new_bpm):
@@ -503,35 +435,27 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
         self.piano_roll.set_bpm(new_bpm)
         self.update_slider_range()
         self.update_timer_interval()
-        if hasattr(self.midi_player, 'set_tempo'):
-            self.midi_player.set_tempo(new_bpm)
+        self.midi_player.set_tempo(new_bpm)
 
     @Slot(int)
     def instrument_changed_slot(self, program_num: int):
         """Handles instrument change from the transport controls."""
-        if hasattr(self.midi_player, 'set_instrument'):
-            print(f"MainWindow: Instrument changed to program {program_num}")
-            self.midi_player.set_instrument(program_num)
-        else:
-            print(f"MainWindow: MidiPlayer does not have set_instrument method.")
+        print(f"MainWindow: Instrument changed to program {program_num}")
+        self.midi_player.set_instrument(program_num)
 
     @Slot(int)
     def volume_changed_slot(self, volume_percentage: int):
         """Handles volume change from the transport controls."""
-        volume_float = volume_percentage / 100.0
-        if hasattr(self.midi_player, 'set_volume'):
-            self.midi_player.set_volume(volume_float)
-        else:
-            print(f"MainWindow: MidiPlayer does not have set_volume method.")
+        self.midi_player.set_volume(volume_percentage / 100.0)
     
     @Slot(bool)
     def toggle_ai_mode(self, is_ai_mode: bool):
         """Toggle between Plugin Manager and AI Studio modes"""
         if is_ai_mode:
             # Switch to AI Studio
-            if hasattr(self, 'plugin_manager_panel'):
+            if self.plugin_manager_panel is not None:
                 self.plugin_manager_panel.setVisible(False)
-            if hasattr(self, 'ai_studio_panel'):
+            if self.ai_studio_panel is not None:
                 self.ai_studio_panel.setVisible(True)
                 # Update AI Studio with current notes
                 self.ai_studio_panel.set_current_notes(self.midi_notes)
@@ -546,37 +470,37 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
             print("MainWindow: Switched to AI Studio mode")
         else:
             # Switch to Plugin Manager
-            if hasattr(self, 'ai_studio_panel'):
+            if self.ai_studio_panel is not None:
                 self.ai_studio_panel.setVisible(False)
-            if hasattr(self, 'plugin_manager_panel'):
-                self.plugin_manager_panel.setVisible(True)
-                # Update Plugin Manager with current notes
-                self.plugin_manager_panel.set_current_notes(self.midi_notes)
-                # Ensure it's dockable if it was floating
-                if self.plugin_manager_panel.isFloating():
-                    # If floating, make sure it still has all features enabled
-                    self.plugin_manager_panel.setFeatures(
-                        QDockWidget.DockWidgetMovable | 
-                        QDockWidget.DockWidgetFloatable | 
-                        QDockWidget.DockWidgetClosable
-                    )
+            plugin_panel = self._ensure_plugin_panel()
+            plugin_panel.setVisible(True)
+            # Update Plugin Manager with current notes
+            plugin_panel.set_current_notes(self.midi_notes)
+            # Ensure it's dockable if it was floating
+            if plugin_panel.isFloating():
+                # If floating, make sure it still has all features enabled
+                plugin_panel.setFeatures(
+                    QDockWidget.DockWidgetMovable | 
+                    QDockWidget.DockWidgetFloatable | 
+                    QDockWidget.DockWidgetClosable
+                )
             print("MainWindow: Switched to Plugin Manager mode")
     
     def update_timer_interval(self):
-        base_interval = 16
-        scaled_interval = min(30, max(5, int(base_interval * (120 / max(1, self.bpm)))))
-        was_active = self.playback_timer.isActive()
-        if was_active:
-            self.playback_timer.stop()
-        self.playback_timer.setInterval(scaled_interval)
-        if was_active:
-            self.playback_timer.start()
+        if not self._ui_active:
+            # Hidden or minimized: ticks only need to notice the end of the song
+            scaled_interval = HIDDEN_PLAYBACK_INTERVAL_MS
+        else:
+            base_interval = 16
+            scaled_interval = min(30, max(5, int(base_interval * (120 / max(1, self.bpm)))))
+        # setInterval restarts a running timer itself; many BPM steps map to the same interval
+        if scaled_interval != self.playback_timer.interval():
+            self.playback_timer.setInterval(scaled_interval)
     
     def update_slider_range(self):
-        if hasattr(self, 'total_duration'):
+        if self.transport_controls is not None:
             scaled_duration_ms = int(self.total_duration * 1000)
-            if hasattr(self, 'transport_controls'):
-                self.transport_controls.update_time_slider_maximum(scaled_duration_ms)
+            self.transport_controls.update_time_slider_maximum(scaled_duration_ms)
 
     def toggle_dock_margins_debug(self, enable=None):
         """
@@ -615,15 +539,33 @@ class PianoRollMainWindow(QMainWindow, MainWindowEventHandlersMixin):
         # Call parent implementation for other key events
         super().keyPressEvent(event)
 
+    def _update_ui_active(self):
+        ui_active = self.isVisible() and not self.isMinimized()
+        if ui_active != self._ui_active:
+            self._ui_active = ui_active
+            self.update_timer_interval()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_ui_active()
+        if self._initial_plugin_panel_pending:
+            self._initial_plugin_panel_pending = False
+            # The expose and first paint follow the show; leave them time to happen before the plugin scan
+            QTimer.singleShot(PLUGIN_PANEL_BUILD_DELAY_MS, self._show_initial_plugin_panel)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_ui_active()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._update_ui_active()
+
     def closeEvent(self, event):
         """Clean up resources when window is closed."""
-        # Remove global event filter before closing
-        if hasattr(self, 'global_hotkey_filter'):
-            QApplication.instance().removeEventFilter(self.global_hotkey_filter)
-            print("Global spacebar event filter removed.")
-        
         # Clean up transport controls temporary files
-        if hasattr(self, 'transport_controls') and hasattr(self.transport_controls, 'cleanup_temporary_files'):
+        if self.transport_controls is not None and hasattr(self.transport_controls, 'cleanup_temporary_files'):
             print("MainWindow: Cleaning up transport controls temporary MIDI files...")
             self.transport_controls.cleanup_temporary_files()
         
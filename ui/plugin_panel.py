@@ -10,7 +10,8 @@ import threading
 
 from plugin_manager import PluginManager
 from ui.plugin_dialogs import PluginParameterDialog
-from .custom_widgets import ModernButton
+from .custom_widgets import ModernButton, get_icon
+from .widget_styles import GLOBAL_QSS
 from config import theme
 
 class PluginGenerationWorker(QThread):
@@ -60,7 +61,9 @@ class PluginManagerPanel(QDockWidget):
         
         self.dock_content = QWidget()
         self.setWidget(self.dock_content)
-        self.dock_content.setStyleSheet(f"background-color: {theme.PANEL_BG_COLOR.name()};") # Panel Styling
+        # Panel Styling; the background applies to every child, so the custom widget rules
+        # are repeated here to keep buttons from inheriting the flat panel color
+        self.dock_content.setStyleSheet(f"* {{ background-color: {theme.PANEL_BG_COLOR.name()}; }}" + GLOBAL_QSS)
         
         main_panel_layout = QVBoxLayout(self.dock_content)
         main_panel_layout.setContentsMargins(theme.PADDING_L, theme.PADDING_L, theme.PADDING_L, theme.PADDING_L) # Panel Styling
@@ -122,7 +125,7 @@ class PluginManagerPanel(QDockWidget):
         # Use the centrally defined PLUGIN_ICON_PATH_DEFAULT from theme.py
         # This path is already resolved by get_resource_path.
         if hasattr(theme, 'PLUGIN_ICON_PATH_DEFAULT') and os.path.exists(theme.PLUGIN_ICON_PATH_DEFAULT):
-            icon = QIcon(theme.PLUGIN_ICON_PATH_DEFAULT)
+            icon = get_icon(theme.PLUGIN_ICON_PATH_DEFAULT)
             if not icon.isNull():
                 return icon
         # Fallback emoji if default SVG is missing, invalid, or path not defined in theme
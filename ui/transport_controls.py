@@ -4,7 +4,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal, Slot, QSize, QUrl, QMimeData
 from PySide6.QtGui import QFont, QIcon, QDrag
-from ui.custom_widgets import ModernSlider, ModernIconButton, ModernButton, DragExportButton
+from ui.custom_widgets import ModernSlider, ModernIconButton, ModernButton, DragExportButton, get_icon
 from ui.model_downloader import ModelDownloaderDialog
 from config import theme, constants
 import tempfile
@@ -91,11 +91,11 @@ class TransportControls(QWidget):
         layout.setSpacing(theme.PADDING_M)
 
         # Load icons
-        self.play_icon = QIcon(theme.PLAY_ICON_PATH)
-        self.pause_icon = QIcon(theme.PAUSE_ICON_PATH)
-        self.stop_icon = QIcon(theme.STOP_ICON_PATH)
-        self.clear_icon = QIcon(theme.CLEAR_ICON_PATH)
-        self.file_icon = QIcon(theme.FILE_ICON_PATH)
+        self.play_icon = get_icon(theme.PLAY_ICON_PATH)
+        self.pause_icon = get_icon(theme.PAUSE_ICON_PATH)
+        self.stop_icon = get_icon(theme.STOP_ICON_PATH)
+        self.clear_icon = get_icon(theme.CLEAR_ICON_PATH)
+        self.file_icon = get_icon(theme.FILE_ICON_PATH)
         
         # === PLAYBACK CONTROLS ===
         playback_group = CompactControlGroup()
@@ -706,6 +706,16 @@ class TransportControls(QWidget):
         self.time_slider.setValue(slider_val)
         self.time_slider.blockSignals(False)
 
+    def reset_to_zero(self, playing=False):
+        """Set the play state and move the slider and position label back to 0 in one repaint."""
+        self.setUpdatesEnabled(False)
+        try:
+            self.set_playing_state(playing)
+            self.update_time_slider_value(0)
+            self.update_position_label(0)
+        finally:
+            self.setUpdatesEnabled(True)
+
     @Slot(int)
     def update_time_slider_maximum(self, max_ms):
         self.time_slider.setMaximum(max_ms)
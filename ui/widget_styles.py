@@ -0,0 +1,429 @@
+"""
+Shared stylesheets: the rules for the custom widgets in ui.custom_widgets, and the
+main window stylesheet built on top of them.
+
+Rules are keyed on the ``modernRole`` dynamic property instead of being set on
+each widget, so Qt parses them once per stylesheet owner (the application and
+the few containers whose own stylesheets would otherwise shadow them) rather
+than once per button or slider.
+"""
+
+import re
+
+from config import theme
+
+# Dynamic property read by the selectors below, and its values
+MODERN_ROLE_PROPERTY = "modernRole"
+ROLE_STANDARD_BUTTON = "standard"
+ROLE_ACCENT_BUTTON = "accent"
+ROLE_ICON_BUTTON = "icon"
+ROLE_SLIDER = "modern"
+
+# Corner radius of the default 36x36 (circular) ModernIconButton
+ICON_BUTTON_DEFAULT_RADIUS = 18
+
+# Slider track color (the legacy SLIDER_TRACK_COLOR was retired from config.theme)
+_TRACK_BG = theme.INPUT_BG_COLOR.name()
+# Filled part color - the accent, lightened unless it is already very light
+_SUB_PAGE_BG = (theme.ACCENT_PRIMARY_COLOR.darker(120) if theme.ACCENT_PRIMARY_COLOR.lightness() > 200
+                else theme.ACCENT_PRIMARY_COLOR.lighter(120)).name()
+
+
+_QSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+
+def _strip_qss_comments(qss: str) -> str:
+    """Drop /* ... */ comments so Qt's parser only sees the rules themselves."""
+    return _QSS_COMMENT_RE.sub("", qss)
+
+
+def _role_selector(widget_class, role):
+    return f'{widget_class}[{MODERN_ROLE_PROPERTY}="{role}"]'
+
+
+# Rule templates, one fragment per QSS block, joined once and filled in with
+# str.format_map by the builders below
+_SLIDER_TEMPLATE = "".join((
+    """
+        {selector}::groove {{
+            background: {track_bg};
+            border-radius: {radius}px;
+        }}
+        {selector}::groove:horizontal {{
+            height: {groove_size}px; /* Use theme spacing */
+        }}
+        {selector}::groove:vertical {{
+            width: {groove_size}px;
+        }}
+    """,
+    """
+        {selector}::handle {{
+            width: {handle_size}px;
+            height: {handle_size}px;
+            border-radius: {handle_radius}px; /* Circular handle */
+            border: 1px solid {handle_border}; /* Subtle border for definition */
+        }}
+        {selector}::handle:hover {{
+            border: 1px solid {hover_border};
+        }}
+        {selector}::handle:pressed {{
+            border: 1px solid {pressed_border};
+        }}
+    """,
+    """
+        /* Only the gradient direction and the centering margins depend on orientation */
+        {selector}::handle:horizontal {{
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {handle_top}, stop:1 {handle_bottom});
+            margin: -{handle_margin}px 0px; /* Center handle on groove */
+        }}
+        {selector}::handle:horizontal:hover {{
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {hover_top}, stop:1 {hover_bottom});
+        }}
+        {selector}::handle:horizontal:pressed {{
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {pressed_top}, stop:1 {pressed_bottom});
+        }}
+        {selector}::handle:vertical {{
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {handle_top}, stop:1 {handle_bottom});
+            margin: 0px -{handle_margin}px;
+        }}
+        {selector}::handle:vertical:hover {{
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {hover_top}, stop:1 {hover_bottom});
+        }}
+        {selector}::handle:vertical:pressed {{
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {pressed_top}, stop:1 {pressed_bottom});
+        }}
+    """,
+    """
+        {selector}::add-page, {selector}::sub-page {{
+            border-radius: {radius}px;
+        }}
+        /* Vertical sliders fill from the bottom, so the page roles swap */
+        {selector}::add-page:horizontal, {selector}::sub-page:vertical {{
+            background: {track_bg}; /* Unfilled part */
+        }}
+        {selector}::sub-page:horizontal, {selector}::add-page:vertical {{
+            background: {sub_page_bg}; /* Filled part */
+        }}
+    """,
+))
+
+_BUTTON_TEMPLATE = "".join((
+    """
+        {selector} {{
+            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {bg_top}, stop:1 {bg_bottom});
+            color: {text_color};
+            border: 1px solid {border_color}; 
+            padding: {padding_v}px {padding_h}px;
+            border-radius: {radius}px;
+            font-family: "{font_family}";
+            font-size: {font_size}pt;
+            text-align: center;
+        }}
+    """,
+    """
+        {selector}:hover {{
+            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {hover_top}, stop:1 {hover_bottom});
+            border: 1px solid {border_hover_color};
+        }}
+        {selector}:pressed {{
+            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {pressed_top}, stop:1 {pressed_bottom});
+            border: 1px solid {pressed_border_color};
+        }}
+    """,
+    """
+        {selector}:focus {{
+            border: 1px solid {focus_color};
+        }}
+        {selector}:disabled {{
+            background-color: {disabled_bg}; 
+            color: {disabled_text};
+            border: 1px solid {disabled_border};
+        }}
+    """,
+))
+
+_ICON_BUTTON_TEMPLATE = "".join((
+    """
+        {selector} {{
+            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {bg_top}, stop:1 {bg_bottom});
+            color: {icon_color}; /* For text if any, icon color is usually from icon itself */
+            border: 1px solid {border_color};
+            border-radius: {radius}px; 
+            padding: {padding}px; 
+        }}
+    """,
+    """
+        {selector}:hover {{
+            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {hover_top}, stop:1 {hover_bottom});
+            border: 1px solid {border_hover_color};
+        }}
+        {selector}:pressed {{
+            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {pressed_top}, stop:1 {pressed_bottom});
+            border: 1px solid {pressed_border_color};
+        }}
+    """,
+    """
+        {selector}:checked {{ /* For toggle buttons */
+            background-color: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {checked_top}, stop:1 {checked_bottom});
+            border: 1px solid {checked_border_color};
+            color: {checked_icon_color}; /* Icon color for checked state */
+        }}
+        {selector}:focus {{
+            border: 1px solid {focus_color};
+        }}
+        {selector}:disabled {{
+            background-color: {disabled_bg};
+            border: 1px solid {disabled_border};
+            /* Icon might need to be a different disabled version or QSS might not colorize it directly */
+        }}
+    """,
+))
+
+
+def _slider_rules(selector):
+    """QSS rules for ModernSlider, scoped to the given selector."""
+    return _SLIDER_TEMPLATE.format_map({
+        "selector": selector,
+        "groove_size": theme.PADDING_S,
+        "radius": theme.BORDER_RADIUS_S,
+        "track_bg": _TRACK_BG,
+        "sub_page_bg": _SUB_PAGE_BG,
+        "handle_size": theme.ICON_SIZE_M,
+        "handle_margin": (theme.ICON_SIZE_M - theme.PADDING_S) // 2,
+        "handle_radius": theme.ICON_SIZE_M // 2,
+        "handle_top": theme.ACCENT_PRIMARY_L115,
+        "handle_bottom": theme.ACCENT_PRIMARY_D115,
+        "handle_border": theme.ACCENT_PRIMARY_D130,
+        "hover_top": theme.ACCENT_HOVER_L115,
+        "hover_bottom": theme.ACCENT_HOVER_D115,
+        "hover_border": theme.ACCENT_HOVER_D130,
+        "pressed_top": theme.ACCENT_PRESSED_L115,
+        "pressed_bottom": theme.ACCENT_PRESSED_D115,
+        "pressed_border": theme.ACCENT_PRESSED_D130,
+    })
+
+
+def _button_rules(selector, accent):
+    """QSS rules for the accent or standard ModernButton variant, scoped to the given selector."""
+    if accent:
+        values = {
+            "bg_top": theme.ACCENT_PRIMARY_L105,
+            "bg_bottom": theme.ACCENT_PRIMARY_NAME,
+            "hover_top": theme.ACCENT_HOVER_L105,
+            "hover_bottom": theme.ACCENT_HOVER_NAME,
+            "pressed_top": theme.ACCENT_PRESSED_NAME,
+            "pressed_bottom": theme.ACCENT_PRESSED_D105,
+            "pressed_border_color": theme.ACCENT_PRESSED_D120,
+            "text_color": theme.ACCENT_TEXT_NAME,
+            "border_color": theme.ACCENT_PRIMARY_D120,
+            "border_hover_color": theme.ACCENT_HOVER_D120,
+        }
+    else:
+        values = {
+            "bg_top": theme.STANDARD_BUTTON_BG_L105,
+            "bg_bottom": theme.STANDARD_BUTTON_BG_NAME,
+            "hover_top": theme.STANDARD_BUTTON_HOVER_BG_L105,
+            "hover_bottom": theme.STANDARD_BUTTON_HOVER_BG_NAME,
+            "pressed_top": theme.STANDARD_BUTTON_PRESSED_BG_NAME,
+            "pressed_bottom": theme.STANDARD_BUTTON_PRESSED_BG_D105,
+            "pressed_border_color": theme.STANDARD_BUTTON_PRESSED_BG_D120,
+            "text_color": theme.STANDARD_BUTTON_TEXT_NAME,
+            "border_color": theme.BORDER_COLOR_NORMAL_NAME,
+            "border_hover_color": theme.BORDER_COLOR_HOVER_NAME,
+        }
+
+    values.update(
+        selector=selector,
+        padding_v=theme.PADDING_S,
+        padding_h=theme.PADDING_M,
+        radius=theme.BORDER_RADIUS_M,
+        font_family=theme.FONT_FAMILY_PRIMARY,
+        font_size=theme.FONT_SIZE_M,
+        focus_color=theme.ACCENT_PRIMARY_NAME,
+        disabled_bg=theme.DISABLED_BG_NAME,
+        disabled_text=theme.DISABLED_TEXT_NAME,
+        disabled_border=theme.DISABLED_BORDER_NAME,
+    )
+    return _BUTTON_TEMPLATE.format_map(values)
+
+
+def _icon_button_rules(selector, border_radius):
+    """QSS rules for ModernIconButton with the given corner radius, scoped to the given selector."""
+    return _ICON_BUTTON_TEMPLATE.format_map({
+        "selector": selector,
+        "radius": border_radius,
+        "padding": theme.PADDING_S,
+        "bg_top": theme.STANDARD_BUTTON_BG_L105,
+        "bg_bottom": theme.STANDARD_BUTTON_BG_NAME,
+        "hover_top": theme.STANDARD_BUTTON_HOVER_BG_L105,
+        "hover_bottom": theme.STANDARD_BUTTON_HOVER_BG_NAME,
+        "pressed_top": theme.STANDARD_BUTTON_PRESSED_BG_NAME,
+        "pressed_bottom": theme.STANDARD_BUTTON_PRESSED_BG_D105,
+        "pressed_border_color": theme.STANDARD_BUTTON_PRESSED_BG_D120,
+        "checked_top": theme.ACCENT_PRIMARY_L105,
+        "checked_bottom": theme.ACCENT_PRIMARY_NAME,
+        "checked_border_color": theme.ACCENT_PRIMARY_D120,
+        "checked_icon_color": theme.ACCENT_TEXT_NAME,
+        "icon_color": theme.PRIMARY_TEXT_NAME,
+        "border_color": theme.BORDER_COLOR_NORMAL_NAME,
+        "border_hover_color": theme.BORDER_COLOR_HOVER_NAME,
+        "focus_color": theme.ACCENT_PRIMARY_NAME,
+        "disabled_bg": theme.DISABLED_BG_NAME,
+        "disabled_border": theme.DISABLED_BORDER_NAME,
+    })
+
+
+def icon_button_radius_rules(border_radius):
+    """Per-widget override for ModernIconButtons whose radius differs from the default."""
+    return f"QToolButton {{ border-radius: {border_radius}px; }}"
+
+
+GLOBAL_QSS = _strip_qss_comments("".join([
+    _button_rules(_role_selector("QPushButton", ROLE_STANDARD_BUTTON), accent=False),
+    _button_rules(_role_selector("QPushButton", ROLE_ACCENT_BUTTON), accent=True),
+    _icon_button_rules(_role_selector("QToolButton", ROLE_ICON_BUTTON), ICON_BUTTON_DEFAULT_RADIUS),
+    _slider_rules(_role_selector("QSlider", ROLE_SLIDER)),
+]))
+
+
+# Main window stylesheet. Formatted once here rather than again for every new
+# window. A window stylesheet outranks the application one, so it repeats the custom widget
+# rules; their property selectors are more specific than the QPushButton rule
+MAIN_WINDOW_QSS = _strip_qss_comments(f"""
+        QMainWindow, QWidget {{
+            background-color: {theme.APP_BG_COLOR.name()};
+            color: {theme.PRIMARY_TEXT_COLOR.name()};
+            font-family: "{theme.FONT_FAMILY_PRIMARY}";
+            font-size: {theme.FONT_SIZE_M}pt;
+        }}
+
+        QLabel {{
+            color: {theme.PRIMARY_TEXT_COLOR.name()};
+            font-family: "{theme.FONT_FAMILY_PRIMARY}";
+            font-size: {theme.FONT_SIZE_M}pt;
+        }}
+
+        QDockWidget::title {{
+            background-color: {theme.PANEL_BG_COLOR.darker(110).name()};
+            color: {theme.PRIMARY_TEXT_COLOR.name()};
+            font-family: "{theme.FONT_FAMILY_PRIMARY}";
+            font-size: {theme.FONT_SIZE_L}pt;
+            font-weight: {theme.FONT_WEIGHT_BOLD};
+            padding: {theme.PADDING_S}px {theme.PADDING_M}px;
+            border-bottom: 1px solid {theme.BORDER_COLOR_NORMAL.name()};
+            text-align: left;
+        }}
+
+        QDockWidget {{
+            border: 1px solid {theme.BORDER_COLOR_NORMAL.name()};
+            titlebar-close-icon: url();
+            titlebar-normal-icon: url();
+        }}
+        
+        /* Dock widget separator styling */
+        QMainWindow::separator {{
+            background-color: {theme.BORDER_COLOR_NORMAL.name()};
+            width: 2px;
+            height: 2px;
+        }}
+        
+        QMainWindow::separator:hover {{
+            background-color: {theme.ACCENT_PRIMARY_COLOR.name()};
+        }}
+        
+        /* Ensure dock indicators are visible */
+        QMainWindow QRubberBand {{
+            background-color: {theme.ACCENT_PRIMARY_COLOR.name()};
+            border: 2px solid {theme.ACCENT_HOVER_COLOR.name()};
+            opacity: 0.7;
+        }}
+        
+        QScrollBar:horizontal {{
+            background-color: {theme.PANEL_BG_COLOR.lighter(110).name()};
+            height: 10px;
+            margin: 0px 0px 0px 0px;
+            border-radius: {theme.BORDER_RADIUS_S}px;
+        }}
+        QScrollBar::handle:horizontal {{
+            background-color: {theme.BORDER_COLOR_NORMAL.name()};
+            min-width: 20px;
+            border-radius: {theme.BORDER_RADIUS_S}px;
+            margin: 2px 0px 2px 0px;
+        }}
+        QScrollBar::handle:horizontal:hover {{
+            background-color: {theme.BORDER_COLOR_HOVER.name()};
+        }}
+        QScrollBar::handle:horizontal:pressed {{
+            background-color: {theme.ACCENT_PRIMARY_COLOR.name()};
+        }}
+        QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {{
+            border: none;
+            background: none;
+            width: 0px;
+        }}
+        QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {{
+            background: none;
+        }}
+
+        QScrollBar:vertical {{
+            background-color: {theme.PANEL_BG_COLOR.lighter(110).name()};
+            width: 10px;
+            margin: 0px 0px 0px 0px;
+            border-radius: {theme.BORDER_RADIUS_S}px;
+        }}
+        QScrollBar::handle:vertical {{
+            background-color: {theme.BORDER_COLOR_NORMAL.name()};
+            min-height: 20px;
+            border-radius: {theme.BORDER_RADIUS_S}px;
+            margin: 0px 2px 0px 2px;
+        }}
+        QScrollBar::handle:vertical:hover {{
+            background-color: {theme.BORDER_COLOR_HOVER.name()};
+        }}
+        QScrollBar::handle:vertical:pressed {{
+            background-color: {theme.ACCENT_PRIMARY_COLOR.name()};
+        }}
+        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+            border: none;
+            background: none;
+            height: 0px;
+        }}
+        QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{
+            background: none;
+        }}
+
+        QScrollArea {{
+            background-color: {theme.PIANO_ROLL_BG_COLOR.name()}; 
+            border: 1px solid {theme.BORDER_COLOR_NORMAL.name()};
+        }}
+        
+        QPushButton {{
+            background-color: {theme.STANDARD_BUTTON_BG_COLOR.name()};
+            color: {theme.STANDARD_BUTTON_TEXT_COLOR.name()};
+            border: 1px solid {theme.BORDER_COLOR_NORMAL.name()};
+            padding: {theme.PADDING_S}px {theme.PADDING_M}px;
+            border-radius: {theme.BORDER_RADIUS_M}px;
+            font-family: "{theme.FONT_FAMILY_PRIMARY}";
+            font-size: {theme.FONT_SIZE_M}pt;
+        }}
+        QPushButton:hover {{
+            background-color: {theme.STANDARD_BUTTON_HOVER_BG_COLOR.name()};
+            border: 1px solid {theme.BORDER_COLOR_HOVER.name()};
+        }}
+        QPushButton:pressed {{
+            background-color: {theme.STANDARD_BUTTON_PRESSED_BG_COLOR.name()};
+        }}
+        QPushButton:disabled {{
+            background-color: {theme.DISABLED_BG_COLOR.name()};
+            color: {theme.DISABLED_TEXT_COLOR.name()};
+            border-color: {theme.DISABLED_BORDER_COLOR.name()};
+        }}
+    """) + GLOBAL_QSS
+
+# Scroll area around the piano roll's note area
+PIANO_ROLL_SCROLL_QSS = _strip_qss_comments("""
+    QScrollArea {
+        border: none;
+        background-color: #1c1c20;
+    }
+""")